@@ -1,3 +1,4 @@
+from generators.batch_runner import BatchRunner
 from generators.comparison_generator import ComparisonGenerator
 from generators.objection_generator import ObjectionGenerator
 from generators.summary_generator import SummaryGenerator
@@ -0,0 +1,301 @@
+"""Helpers shared by the competitor-level generators.
+
+The objection, cross-cutting and narrative calls for one competitor all
+send the same system prompt and the same formatted source documents. These
+helpers lay the request out so that shared prefix comes first and is marked
+for Anthropic prompt caching; only the task-specific tail changes per call.
+"""
+
+import logging
+import threading
+from functools import lru_cache
+from pathlib import Path
+from string import Formatter
+from typing import Optional
+
+import tiktoken
+
+from schemas.source_record import SourceRecord
+
+logger = logging.getLogger(__name__)
+
+PROMPTS_DIR = Path(__file__).parent / "prompts"
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+# Prompt ordering of sources: official > third_party > community > other
+CREDIBILITY_ORDER = {"official": 0, "third_party": 1, "community": 2}
+
+# Share of the source token budget each credibility tier gets per record
+CREDIBILITY_WEIGHTS = {"official": 3, "third_party": 2, "community": 1}
+
+# Records whose allotment falls below this are dropped rather than cut to a stub
+MIN_RECORD_TOKENS = 50
+
+_FOOTER = "\n\n---\n\n"
+_FOOTER_TOKENS = 3
+
+# Approximates Claude's tokenizer closely enough for budgeting
+_ENCODER: Optional[tiktoken.Encoding] = None
+
+# Formatted source blocks, keyed on the formatting limits + record ids.
+# Small, since only one competitor's KX/competitor lists are live at a time.
+_FORMAT_CACHE: dict[tuple, str] = {}
+_FORMAT_CACHE_SIZE = 8
+# One lock per cache key, so concurrent generators asking for the same
+# sources wait for a single fill instead of each formatting them
+_FORMAT_LOCKS: dict[tuple, threading.Lock] = {}
+_FORMAT_LOCKS_GUARD = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def load_prompt(name: str) -> str:
+    """Read a prompt file from PROMPTS_DIR, once per process."""
+    return (PROMPTS_DIR / name).read_text()
+
+
+def system_blocks(system_text: str) -> list[dict]:
+    """Wrap the system prompt as a cacheable content block."""
+    return [{"type": "text", "text": system_text, "cache_control": CACHE_CONTROL}]
+
+
+def cached_user_message(sources_text: str, task_text: str) -> dict:
+    """Build a user message with the source documents as a cached prefix.
+
+    The cache breakpoint sits after the sources block, so system prompt +
+    sources are reused across calls and only task_text is billed in full.
+    """
+    return {
+        "role": "user",
+        "content": [
+            {"type": "text", "text": sources_text, "cache_control": CACHE_CONTROL},
+            {"type": "text", "text": task_text},
+        ],
+    }
+
+
+def prefill_message(prefix: str) -> dict:
+    """Assistant turn that makes the response continue from prefix."""
+    return {"role": "assistant", "content": prefix}
+
+
+def prefill_of(params: dict) -> str:
+    """Return the assistant prefill in request params, or "" if none."""
+    last = params["messages"][-1]
+    return last["content"] if last["role"] == "assistant" else ""
+
+
+def split_template(raw: str) -> list[tuple[str, Optional[str]]]:
+    """Pre-split a str.format template into (literal, field_name) pairs.
+
+    Escaped braces come back as literal text; format specs are not supported.
+    """
+    return [(literal, field) for literal, field, _, _ in Formatter().parse(raw)]
+
+
+def render_template(parts: list[tuple[str, Optional[str]]], **values: str) -> str:
+    """Fill a template pre-split by split_template with a single join."""
+    pieces = []
+    for literal, field in parts:
+        pieces.append(literal)
+        if field is not None:
+            pieces.append(values[field])
+    return "".join(pieces)
+
+
+def format_sources(records: list[SourceRecord], max_tokens: int) -> str:
+    """Format sources for prompt inclusion within a token budget.
+
+    The objection, cross-cutting and narrative calls format the same record
+    lists for a competitor, so results are memoized on the record ids.
+    Concurrent calls for the same lists format them once; the others wait.
+    """
+    key = (max_tokens, tuple(r.id for r in records))
+    formatted = _FORMAT_CACHE.get(key)
+    if formatted is not None:
+        return formatted
+
+    with _FORMAT_LOCKS_GUARD:
+        lock = _FORMAT_LOCKS.setdefault(key, threading.Lock())
+    with lock:
+        formatted = _FORMAT_CACHE.get(key)
+        if formatted is None:
+            formatted = _format_sources(records, max_tokens)
+            with _FORMAT_LOCKS_GUARD:
+                if len(_FORMAT_CACHE) >= _FORMAT_CACHE_SIZE:
+                    _FORMAT_CACHE.clear()
+                    _FORMAT_LOCKS.clear()
+                _FORMAT_CACHE[key] = formatted
+    return formatted
+
+
+def order_by_credibility(records: list[SourceRecord]) -> list[SourceRecord]:
+    """Stable-partition records by CREDIBILITY_ORDER tier in one pass."""
+    buckets: tuple[list, ...] = ([], [], [], [])
+    for record in records:
+        buckets[CREDIBILITY_ORDER.get(record.credibility.value, 3)].append(record)
+    return buckets[0] + buckets[1] + buckets[2] + buckets[3]
+
+
+def allocate_budget(needs: list[int], weights: list[int], total: int) -> list[int]:
+    """Split total tokens across records in proportion to their weights.
+
+    Weighted water-filling: no record gets more than it needs, and whatever
+    a short record leaves unused is shared among the rest by weight.
+    """
+    alloc = [0] * len(needs)
+    remaining = total
+    remaining_weight = sum(weights)
+    for i in sorted(range(len(needs)), key=lambda i: needs[i] / weights[i]):
+        share = remaining * weights[i] // remaining_weight
+        alloc[i] = min(needs[i], share)
+        remaining -= alloc[i]
+        remaining_weight -= weights[i]
+    return alloc
+
+
+def _format_sources(records: list[SourceRecord], max_tokens: int) -> str:
+    sorted_records = order_by_credibility(records)
+
+    encoder = _get_encoder()
+    headers = [
+        f"### [{r.source_type.value}] {r.title}\n**URL**: {r.url}\n\n"
+        for r in sorted_records
+    ]
+    overheads = [
+        len(encoder.encode_ordinary(header)) + _FOOTER_TOKENS for header in headers
+    ]
+
+    # Pick the records first, in credibility order: each kept record is
+    # guaranteed MIN_RECORD_TOKENS of text (or all of it, if shorter), and
+    # records are taken while those guarantees fit in the budget. Only the
+    # kept records then share what is left, so nothing allotted is lost.
+    kept = []
+    reserved = 0
+    for i, record in enumerate(sorted_records):
+        if reserved + overheads[i] > max_tokens:
+            continue
+        probe = _encode_prefix(encoder, record.text, MIN_RECORD_TOKENS)
+        floor = overheads[i] + min(len(probe), MIN_RECORD_TOKENS)
+        if reserved + floor <= max_tokens:
+            kept.append((i, probe))
+            reserved += floor
+    pool = max_tokens - reserved
+
+    # No record can get more than the pool on top of its floor, so longer
+    # texts are only tokenized that far
+    tokens = []
+    for i, probe in kept:
+        if len(probe) > MIN_RECORD_TOKENS and pool:
+            limit = MIN_RECORD_TOKENS + pool
+            probe = _encode_prefix(encoder, sorted_records[i].text, limit)
+        tokens.append(probe)
+    extras = allocate_budget(
+        [max(0, len(toks) - MIN_RECORD_TOKENS) for toks in tokens],
+        [
+            CREDIBILITY_WEIGHTS.get(sorted_records[i].credibility.value, 1)
+            for i, _ in kept
+        ],
+        pool,
+    )
+
+    parts = []
+    for (i, _), toks, extra in zip(kept, tokens, extras):
+        record = sorted_records[i]
+        text_budget = min(len(toks), MIN_RECORD_TOKENS) + extra
+        if text_budget >= len(toks):
+            text = record.text
+        else:
+            text = encoder.decode(toks[:text_budget])
+        # Join pieces once at the end rather than building a per-record string
+        parts += (headers[i], text, _FOOTER)
+
+    # A corpus larger than the budget should leave next to nothing unused
+    used = reserved + sum(extras)
+    if len(kept) < len(sorted_records) and used < 0.9 * max_tokens:
+        logger.warning(
+            "Formatted sources use %d of %d tokens with %d of %d records dropped",
+            used, max_tokens,
+            len(sorted_records) - len(kept), len(sorted_records),
+        )
+
+    return "".join(parts) if parts else "[No sources available]"
+
+
+def _encode_prefix(encoder: tiktoken.Encoding, text: str, limit: int) -> list[int]:
+    """Tokenize text, stopping once it is known to exceed limit tokens.
+
+    Returns all of text's tokens if there are at most limit of them, and
+    otherwise limit + 1 leading tokens (enough to cut at any budget up to
+    limit). Prefixes are encoded in doubling chunks, so a long record costs
+    about what its kept part does rather than its full length.
+    """
+    chars = (limit + 2) * 4
+    while chars < len(text):
+        toks = encoder.encode_ordinary(text[:chars])
+        # The cut can split the final word, so keep a token of slack
+        if len(toks) > limit + 1:
+            return toks[: limit + 1]
+        chars *= 2
+    return encoder.encode_ordinary(text)
+
+
+def _get_encoder() -> tiktoken.Encoding:
+    global _ENCODER
+    if _ENCODER is None:
+        _ENCODER = tiktoken.get_encoding("cl100k_base")
+    return _ENCODER
+
+
+def stream_text(client, params: dict, stop_after_object: bool = False) -> str:
+    """Stream a messages call and return the response text.
+
+    Any assistant prefill is included at the start of the returned text.
+    With stop_after_object, the stream is closed as soon as the first
+    top-level JSON object is balanced, so trailing prose or a closing code
+    fence is neither waited for nor generated.
+    """
+    parts = [prefill_of(params)]
+    scanner = _ObjectScanner() if stop_after_object else None
+    if scanner is not None:
+        scanner.feed(parts[0])
+    with client.messages.stream(**params) as stream:
+        for text in stream.text_stream:
+            parts.append(text)
+            if scanner is not None and scanner.feed(text):
+                break
+    return "".join(parts)
+
+
+class _ObjectScanner:
+    """Incremental brace matcher that skips braces inside JSON strings."""
+
+    __slots__ = ("depth", "in_str", "escape", "started")
+
+    def __init__(self):
+        self.depth = 0
+        self.in_str = False
+        self.escape = False
+        self.started = False
+
+    def feed(self, text: str) -> bool:
+        """Consume more text; True once the first object has closed."""
+        for ch in text:
+            if self.in_str:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_str = False
+            elif ch == '"':
+                # Quotes only matter once we are inside the object
+                self.in_str = self.started
+            elif ch == "{":
+                self.depth += 1
+                self.started = True
+            elif ch == "}" and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
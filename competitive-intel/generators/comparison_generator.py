@@ -4,20 +4,187 @@ For each taxonomy topic, builds a research bundle of KX + competitor sources,
 sends them to Claude for analysis, and produces structured CompetitiveEntry objects.
 """
 
-import json
 import logging
+import re
+from bisect import bisect_right
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date
+from itertools import accumulate
 from pathlib import Path
 from typing import Optional
 
 import anthropic
+import orjson
 
+from generators.common import load_prompt, order_by_credibility
 from schemas.competitive_entry import CompetitiveEntry
 from schemas.source_record import SourceRecord
 
 logger = logging.getLogger(__name__)
 
-PROMPTS_DIR = Path(__file__).parent / "prompts"
+# Markdown code fence (optionally tagged json) wrapping the response body
+_FENCE_RE = re.compile(r"```(?:json)?\s*\n([\s\S]*?)\n```")
+
+# Concurrent topic generations; keep within the Anthropic per-key rate limit
+DEFAULT_MAX_WORKERS = 8
+
+
+def _topic_index(taxonomy_config: dict) -> dict[str, dict]:
+    """Flatten taxonomy tiers into a topic_id → topic metadata mapping."""
+    return {
+        topic_id: info
+        for tier in taxonomy_config.get("tiers", {}).values()
+        for topic_id, info in tier.get("topics", {}).items()
+    }
+
+
+def _match_closing_brace(text: str, start: int) -> int:
+    """Return the index of the brace closing the object opened at ``start``.
+
+    Single pass that tracks nesting depth and skips braces inside JSON
+    string literals (honouring backslash escapes). Returns -1 if the
+    object is never closed, e.g. when the response was cut off.
+    """
+    depth = 0
+    in_str = False
+    escape = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_str:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+    return -1
+
+
+# ---------------------------------------------------------------------------
+# LLM response normalizers (one per top-level CompetitiveEntry field)
+# ---------------------------------------------------------------------------
+
+def _norm_assessment(ca):
+    """competitor_assessment: wrap a bare string, fill summary/details."""
+    if isinstance(ca, str):
+        return {"summary": ca, "strengths": [], "details": ca, "citations": []}
+    if isinstance(ca, dict):
+        if "details" not in ca:
+            ca["details"] = ca.get("summary", "")
+        if "summary" not in ca:
+            ca["summary"] = ca["details"]
+    return ca
+
+
+def _norm_limitations(cl):
+    """competitor_limitations: flatten a grouped dict, objectify strings."""
+    if isinstance(cl, dict):
+        flat = []
+        for category, items in cl.items():
+            if not isinstance(items, list):
+                continue
+            for item in items:
+                if isinstance(item, str):
+                    flat.append({
+                        "limitation": item,
+                        "evidence_type": category,
+                        "details": item,
+                    })
+                elif isinstance(item, dict):
+                    item.setdefault("evidence_type", category)
+                    flat.append(item)
+        return flat
+    if isinstance(cl, list):
+        normalized = []
+        for item in cl:
+            if isinstance(item, str):
+                normalized.append({
+                    "limitation": item,
+                    "evidence_type": "inferred",
+                    "details": item,
+                })
+            elif isinstance(item, dict):
+                # Map 'category' -> 'evidence_type' if needed
+                if "evidence_type" not in item:
+                    item["evidence_type"] = item.pop("category", "inferred")
+                if "details" not in item:
+                    item["details"] = item.get("limitation", "")
+                normalized.append(item)
+        return normalized
+    return cl
+
+
+def _norm_differentiators(kd):
+    """kx_differentiators: accept a bare string, objectify string items."""
+    if isinstance(kd, str):
+        kd = [kd]
+    if not isinstance(kd, list):
+        return kd
+    normalized = []
+    for item in kd:
+        if isinstance(item, str):
+            normalized.append({
+                "differentiator": item,
+                "explanation": item,
+                "evidence": "",
+            })
+        elif isinstance(item, dict):
+            if "differentiator" not in item:
+                item["differentiator"] = item.get("explanation", "")
+            if "explanation" not in item:
+                item["explanation"] = item["differentiator"]
+            if "evidence" not in item:
+                item["evidence"] = ""
+            normalized.append(item)
+    return normalized
+
+
+def _norm_pitch(ep):
+    """elevator_pitch: wrap a bare string, ensure 'pitch' exists."""
+    if isinstance(ep, str):
+        return {"pitch": ep, "key_stat": None}
+    if isinstance(ep, dict) and "pitch" not in ep:
+        ep["pitch"] = ""
+    return ep
+
+
+def _norm_objections(oh):
+    """objection_handlers: objectify string items, ensure required keys."""
+    if not isinstance(oh, list):
+        return oh
+    normalized = []
+    for item in oh:
+        if isinstance(item, str):
+            normalized.append({
+                "objection": item,
+                "response": "",
+                "supporting_evidence": [],
+            })
+        elif isinstance(item, dict):
+            if "objection" not in item:
+                item["objection"] = ""
+            if "response" not in item:
+                item["response"] = ""
+            normalized.append(item)
+    return normalized
+
+
+_NORMALIZERS = {
+    "competitor_assessment": _norm_assessment,
+    "competitor_limitations": _norm_limitations,
+    "kx_differentiators": _norm_differentiators,
+    "elevator_pitch": _norm_pitch,
+    "objection_handlers": _norm_objections,
+}
 
 
 class ComparisonGenerator:
@@ -39,8 +206,8 @@ class ComparisonGenerator:
         self.max_source_tokens = max_source_tokens
 
         # Load prompt templates
-        self.system_prompt = (PROMPTS_DIR / "system_prompt.txt").read_text()
-        self.topic_template = (PROMPTS_DIR / "topic_analysis.txt").read_text()
+        self.system_prompt = load_prompt("system_prompt.txt")
+        self.topic_template = load_prompt("topic_analysis.txt")
 
     def generate_topic(
         self,
@@ -51,6 +218,7 @@ class ComparisonGenerator:
         kx_sources: list[SourceRecord],
         competitor_sources: list[SourceRecord],
         taxonomy_config: Optional[dict] = None,
+        topic_why: Optional[str] = None,
     ) -> CompetitiveEntry:
         """Generate a competitive entry for a single topic.
 
@@ -61,7 +229,10 @@ class ComparisonGenerator:
             competitor_name: Name of the competitor.
             kx_sources: KX source records tagged with this topic.
             competitor_sources: Competitor source records tagged with this topic.
-            taxonomy_config: Optional taxonomy config for additional context.
+            taxonomy_config: Optional taxonomy config, used to look up
+                             topic_why when it is not given.
+            topic_why: Why capital markets cares about this topic
+                       (defaults to the taxonomy description).
 
         Returns:
             CompetitiveEntry with structured competitive intelligence.
@@ -73,13 +244,12 @@ class ComparisonGenerator:
         )
 
         # Get the "why capital markets cares" from taxonomy if available
-        topic_why = topic_description
-        if taxonomy_config:
-            for tier in taxonomy_config.get("tiers", {}).values():
-                topics = tier.get("topics", {})
-                if topic_id in topics:
-                    topic_why = topics[topic_id].get("description", topic_description)
-                    break
+        if topic_why is None:
+            topic_why = topic_description
+            if taxonomy_config:
+                topic_why = _topic_index(taxonomy_config).get(topic_id, {}).get(
+                    "description", topic_description
+                )
 
         # Build the prompt
         prompt = self.topic_template.format(
@@ -116,10 +286,11 @@ class ComparisonGenerator:
         # Extract JSON from the response (handle markdown code fences)
         json_text = self._extract_json(response_text)
         try:
-            data = json.loads(json_text)
-        except json.JSONDecodeError as e:
+            data = orjson.loads(json_text)
+        except orjson.JSONDecodeError as e:
             logger.error("Failed to parse JSON response for topic %s: %s", topic_id, e)
-            logger.debug("Response text: %s", response_text[:500])
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response text: %s", response_text[:500])
             # Return a minimal entry indicating failure
             return self._empty_entry(
                 topic_id, topic_name, competitor_name, f"JSON parse error: {e}"
@@ -161,9 +332,15 @@ class ComparisonGenerator:
         topics: Optional[list[str]] = None,
         output_dir: Optional[Path] = None,
         resume: bool = True,
+        max_workers: int = DEFAULT_MAX_WORKERS,
     ) -> list[CompetitiveEntry]:
         """Generate competitive entries for all (or specified) topics.
 
+        Topics are generated concurrently (the work is bound on Claude
+        round-trips); entries are returned in taxonomy order regardless.
+        If a topic fails, topics not yet started are cancelled, those in
+        flight are still saved, and the first error is re-raised.
+
         Args:
             competitor_name: Name of the competitor.
             kx_records: All KX source records.
@@ -175,6 +352,7 @@ class ComparisonGenerator:
                         immediately after generation.
             resume: If True and output_dir is set, skip topics that already
                     have a saved file from a previous run.
+            max_workers: Maximum number of topics generated in parallel.
 
         Returns:
             List of CompetitiveEntry objects.
@@ -189,8 +367,11 @@ class ComparisonGenerator:
         # Index records by topic
         kx_by_topic = self._index_by_topic(kx_records)
         comp_by_topic = self._index_by_topic(competitor_records)
+        topic_meta = _topic_index(taxonomy_config)
 
-        entries = []
+        # Position in topic_ids → entry, so output order is deterministic
+        results: dict[int, CompetitiveEntry] = {}
+        pending: list[dict] = []
         skipped = 0
         for i, topic_id in enumerate(topic_ids, 1):
             # Resume: skip topics that already have a saved file
@@ -199,9 +380,8 @@ class ComparisonGenerator:
                 topic_file = output_dir / f"topic_{topic_id}.json"
                 if resume and topic_file.exists():
                     try:
-                        existing = json.loads(topic_file.read_text())
-                        entry = CompetitiveEntry(**existing)
-                        entries.append(entry)
+                        existing = orjson.loads(topic_file.read_bytes())
+                        results[i] = CompetitiveEntry.from_saved(existing)
                         skipped += 1
                         logger.info(
                             "[%d/%d] Skipping topic '%s' (already generated)",
@@ -214,14 +394,9 @@ class ComparisonGenerator:
                         )
 
             # Get topic metadata from taxonomy
-            topic_name = topic_id
-            topic_desc = ""
-            for tier in taxonomy_config.get("tiers", {}).values():
-                topics_dict = tier.get("topics", {})
-                if topic_id in topics_dict:
-                    topic_name = topics_dict[topic_id].get("name", topic_id)
-                    topic_desc = topics_dict[topic_id].get("description", "")
-                    break
+            meta = topic_meta.get(topic_id, {})
+            topic_name = meta.get("name", topic_id)
+            topic_desc = meta.get("description", "")
 
             kx_srcs = kx_by_topic.get(topic_id, [])
             comp_srcs = comp_by_topic.get(topic_id, [])
@@ -233,27 +408,74 @@ class ComparisonGenerator:
                 )
                 continue
 
+            pending.append({
+                "index": i,
+                "topic_file": topic_file,
+                "kwargs": {
+                    "topic_id": topic_id,
+                    "topic_name": topic_name,
+                    "topic_description": topic_desc,
+                    "competitor_name": competitor_name,
+                    "kx_sources": kx_srcs,
+                    "competitor_sources": comp_srcs,
+                    "topic_why": topic_desc,
+                },
+            })
+
+        if pending:
             logger.info(
-                "[%d/%d] Generating topic '%s'...",
-                i, len(topic_ids), topic_id,
+                "Generating %d topics with up to %d concurrent requests",
+                len(pending), max_workers,
             )
-            entry = self.generate_topic(
-                topic_id=topic_id,
-                topic_name=topic_name,
-                topic_description=topic_desc,
-                competitor_name=competitor_name,
-                kx_sources=kx_srcs,
-                competitor_sources=comp_srcs,
-                taxonomy_config=taxonomy_config,
-            )
-            entries.append(entry)
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                futures = {}
+                for job in pending:
+                    logger.info(
+                        "[%d/%d] Generating topic '%s'...",
+                        job["index"], len(topic_ids), job["kwargs"]["topic_id"],
+                    )
+                    futures[executor.submit(self.generate_topic, **job["kwargs"])] = job
+
+                first_error = None
+                for future in as_completed(futures):
+                    job = futures[future]
+                    if future.cancelled():
+                        continue
+                    try:
+                        entry = future.result()
+                    except Exception as e:
+                        logger.error(
+                            "Topic '%s' failed: %s", job["kwargs"]["topic_id"], e
+                        )
+                        if first_error is None:
+                            first_error = e
+                            # Stop starting (and paying for) further topics;
+                            # ones already in flight finish and are saved.
+                            # Cancelled futures still come out of
+                            # as_completed, unlike with shutdown(cancel_futures)
+                            for other in futures:
+                                other.cancel()
+                        continue
+                    results[job["index"]] = entry
+
+                    # Save incrementally so progress survives crashes
+                    topic_file = job["topic_file"]
+                    if topic_file:
+                        data = entry.model_dump(mode="json")
+                        data["_schema_version"] = CompetitiveEntry.SCHEMA_VERSION
+                        topic_file.write_bytes(
+                            orjson.dumps(data, option=orjson.OPT_INDENT_2)
+                        )
+                        logger.info("  Saved %s", topic_file.name)
 
-            # Save incrementally so progress survives crashes
-            if topic_file:
-                topic_file.write_text(
-                    json.dumps(entry.model_dump(mode="json"), indent=2)
+            if first_error is not None:
+                logger.error(
+                    "Stopped after a failed topic; %d of %d topics done",
+                    len(results), len(topic_ids),
                 )
-                logger.info("  Saved %s", topic_file.name)
+                raise first_error
+
+        entries = [results[i] for i in sorted(results)]
 
         if skipped:
             logger.info(
@@ -265,33 +487,34 @@ class ComparisonGenerator:
 
     def _format_sources(self, records: list[SourceRecord], max_chars: int) -> str:
         """Format source records for inclusion in a prompt."""
-        # Sort by credibility: official > third_party > community
-        credibility_order = {"official": 0, "third_party": 1, "community": 2}
-        sorted_records = sorted(
-            records,
-            key=lambda r: credibility_order.get(r.credibility.value, 3),
-        )
+        # Order by credibility: official > third_party > community
+        sorted_records = order_by_credibility(records)
+
+        footer = "\n\n---\n\n"
+        headers = [
+            f"### [{record.source_type.value}] {record.title}\n"
+            f"**URL**: {record.url}\n"
+            f"**Credibility**: {record.credibility.value}\n\n"
+            for record in sorted_records
+        ]
+        # Running entry lengths; the first k entries are those that fit whole
+        cum = list(accumulate(
+            len(header) + len(record.text) + len(footer)
+            for header, record in zip(headers, sorted_records)
+        ))
+        k = bisect_right(cum, max_chars)
 
         parts = []
-        total_chars = 0
-
-        for record in sorted_records:
-            entry = (
-                f"### [{record.source_type.value}] {record.title}\n"
-                f"**URL**: {record.url}\n"
-                f"**Credibility**: {record.credibility.value}\n\n"
-                f"{record.text}\n\n---\n\n"
-            )
+        for header, record in zip(headers[:k], sorted_records[:k]):
+            # Join pieces once at the end rather than building a per-record string
+            parts += (header, record.text, footer)
 
-            if total_chars + len(entry) > max_chars:
-                # Truncate remaining text to fit
-                remaining = max_chars - total_chars
-                if remaining > 200:
-                    parts.append(entry[:remaining] + "\n[TRUNCATED]")
-                break
-
-            parts.append(entry)
-            total_chars += len(entry)
+        if k < len(sorted_records):
+            # Truncate the next record's text to fill what is left
+            remaining = max_chars - (cum[k - 1] if k else 0)
+            if remaining > 200:
+                entry = headers[k] + sorted_records[k].text[:remaining] + footer
+                parts.append(entry[:remaining] + "\n[TRUNCATED]")
 
         if not parts:
             return "[No source documents available for this topic]"
@@ -302,27 +525,29 @@ class ComparisonGenerator:
         self, records: list[SourceRecord]
     ) -> dict[str, list[SourceRecord]]:
         """Index records by their topic tags."""
-        index: dict[str, list[SourceRecord]] = {}
+        index: defaultdict[str, list[SourceRecord]] = defaultdict(list)
         for record in records:
             for topic in record.topics:
-                if topic not in index:
-                    index[topic] = []
                 index[topic].append(record)
-        return index
+        return dict(index)
 
     def _extract_json(self, text: str) -> str:
         """Extract JSON from a response that may contain markdown fences."""
-        # Try to find JSON in code fences
-        import re
-
-        match = re.search(r"```(?:json)?\s*\n([\s\S]*?)\n```", text)
-        if match:
-            return match.group(1)
+        # Try to find JSON in code fences (skip the regex when there are none)
+        if text.find("```") != -1:
+            match = _FENCE_RE.search(text)
+            if match:
+                return match.group(1)
 
         # Try to find a JSON object directly
-        match = re.search(r"\{[\s\S]*\}", text)
-        if match:
-            return match.group(0)
+        start = text.find("{")
+        if start != -1:
+            end = _match_closing_brace(text, start)
+            if end == -1:
+                # Unbalanced (truncated) object: fall back to the last brace
+                end = text.rfind("}")
+            if end > start:
+                return text[start:end + 1]
 
         return text
 
@@ -336,98 +561,9 @@ class ComparisonGenerator:
         - competitor_assessment as a string instead of an object
         - competitor_limitations items using 'category' instead of 'evidence_type'
         """
-        # --- competitor_assessment ---
-        ca = data.get("competitor_assessment")
-        if isinstance(ca, str):
-            data["competitor_assessment"] = {
-                "summary": ca, "strengths": [], "details": ca, "citations": []
-            }
-        elif isinstance(ca, dict):
-            if "details" not in ca:
-                ca["details"] = ca.get("summary", "")
-            if "summary" not in ca:
-                ca["summary"] = ca.get("details", "")
-
-        # --- competitor_limitations: flatten grouped dict to list ---
-        cl = data.get("competitor_limitations")
-        if isinstance(cl, dict):
-            flat = []
-            for category, items in cl.items():
-                if isinstance(items, list):
-                    for item in items:
-                        if isinstance(item, str):
-                            flat.append({
-                                "limitation": item,
-                                "evidence_type": category,
-                                "details": item,
-                            })
-                        elif isinstance(item, dict):
-                            item.setdefault("evidence_type", category)
-                            flat.append(item)
-            data["competitor_limitations"] = flat
-        elif isinstance(cl, list):
-            normalized = []
-            for item in cl:
-                if isinstance(item, str):
-                    normalized.append({
-                        "limitation": item,
-                        "evidence_type": "inferred",
-                        "details": item,
-                    })
-                elif isinstance(item, dict):
-                    # Map 'category' -> 'evidence_type' if needed
-                    if "evidence_type" not in item and "category" in item:
-                        item["evidence_type"] = item.pop("category")
-                    item.setdefault("evidence_type", "inferred")
-                    item.setdefault("details", item.get("limitation", ""))
-                    normalized.append(item)
-            data["competitor_limitations"] = normalized
-
-        # --- kx_differentiators: convert strings to objects ---
-        kd = data.get("kx_differentiators")
-        if isinstance(kd, str):
-            kd = [kd]
-            data["kx_differentiators"] = kd
-        if isinstance(kd, list):
-            normalized = []
-            for item in kd:
-                if isinstance(item, str):
-                    normalized.append({
-                        "differentiator": item,
-                        "explanation": item,
-                        "evidence": "",
-                    })
-                elif isinstance(item, dict):
-                    item.setdefault("differentiator", item.get("explanation", ""))
-                    item.setdefault("explanation", item.get("differentiator", ""))
-                    item.setdefault("evidence", "")
-                    normalized.append(item)
-            data["kx_differentiators"] = normalized
-
-        # --- elevator_pitch: convert string to object ---
-        ep = data.get("elevator_pitch")
-        if isinstance(ep, str):
-            data["elevator_pitch"] = {"pitch": ep, "key_stat": None}
-        elif isinstance(ep, dict):
-            ep.setdefault("pitch", "")
-
-        # --- objection_handlers: convert strings to objects ---
-        oh = data.get("objection_handlers")
-        if isinstance(oh, list):
-            normalized = []
-            for item in oh:
-                if isinstance(item, str):
-                    normalized.append({
-                        "objection": item,
-                        "response": "",
-                        "supporting_evidence": [],
-                    })
-                elif isinstance(item, dict):
-                    item.setdefault("objection", "")
-                    item.setdefault("response", "")
-                    normalized.append(item)
-            data["objection_handlers"] = normalized
-
+        for key, normalize in _NORMALIZERS.items():
+            if key in data:
+                data[key] = normalize(data[key])
         return data
 
     def _empty_entry(
@@ -5,20 +5,76 @@ pushbacks that come up regardless of which specific capability is
 being discussed (e.g., "it's free," "it's SQL," "it's open source").
 """
 
-import json
 import logging
+import re
 from datetime import date
-from pathlib import Path
 from typing import Optional
 
 import anthropic
-
+import orjson
+from pydantic import ValidationError
+
+from generators.common import (
+    cached_user_message,
+    format_sources,
+    load_prompt,
+    prefill_message,
+    render_template,
+    split_template,
+    stream_text,
+    system_blocks,
+)
 from schemas.competitive_entry import ObjectionHandler
 from schemas.source_record import SourceRecord
 
 logger = logging.getLogger(__name__)
 
-PROMPTS_DIR = Path(__file__).parent / "prompts"
+_FENCE_RE = re.compile(r"```(?:json)?\s*\n([\s\S]*?)\n```")
+_BARE_RE = re.compile(r"[\[\{][\s\S]*[\]\}]")
+
+# What malformed LLM output can raise while parsing and building models
+_PARSE_ERRORS = (orjson.JSONDecodeError, AttributeError, TypeError, ValidationError)
+
+# Alternative field names the LLM uses → (canonical field, priority)
+_HANDLER_ALIASES = {
+    alt: (field, rank)
+    for field, alts in (
+        ("objection", ("theme", "concern", "pushback", "question")),
+        ("response", ("rebuttal", "counter", "counter_argument",
+                      "talking_points", "kx_positioning")),
+    )
+    for rank, alt in enumerate(alts)
+}
+
+
+def _flatten_response(val) -> str:
+    """Flatten a nested response value into a readable string."""
+    if isinstance(val, dict):
+        return "; ".join(f"{k}: {v}" for k, v in val.items() if isinstance(v, str))
+    if isinstance(val, list):
+        return " ".join(str(v) for v in val)
+    return str(val)
+
+
+def _build_handler(item: dict) -> ObjectionHandler:
+    """Build an ObjectionHandler, skipping validation when it can't fail.
+
+    model_construct neither checks types nor builds nested citation models,
+    so it is only used when every field already has the schema's type and
+    citations is missing or an empty list; anything else (including None or
+    other falsy values validation would reject) goes through validation.
+    """
+    evidence = item.get("supporting_evidence", [])
+    if (
+        isinstance(item.get("objection"), str)
+        and isinstance(item.get("response"), str)
+        and isinstance(item.get("tone", ""), str)
+        and item.get("citations", []) == []
+        and isinstance(evidence, list)
+        and all(isinstance(e, str) for e in evidence)
+    ):
+        return ObjectionHandler.model_construct(**item)
+    return ObjectionHandler(**item)
 
 
 class ObjectionGenerator:
@@ -28,14 +84,18 @@ class ObjectionGenerator:
         self,
         model: str = "claude-sonnet-4-20250514",
         max_source_tokens: int = 80000,
+        max_output_tokens: int = 4096,
     ):
         self.client = anthropic.Anthropic()
         self.model = model
         self.max_source_tokens = max_source_tokens
+        self.max_output_tokens = max_output_tokens
 
-        self.system_prompt = (PROMPTS_DIR / "system_prompt.txt").read_text()
-        self.objection_template = (PROMPTS_DIR / "objection_handler.txt").read_text()
-        self.cross_cutting_template = (PROMPTS_DIR / "cross_cutting.txt").read_text()
+        self.system_prompt = load_prompt("system_prompt.txt")
+        # Pre-split: this template receives the large source blocks
+        self._sources_parts = split_template(load_prompt("source_documents.txt"))
+        self.objection_template = load_prompt("objection_handler.txt")
+        self.cross_cutting_template = load_prompt("cross_cutting.txt")
 
     def generate_objections(
         self,
@@ -53,42 +113,11 @@ class ObjectionGenerator:
         Returns:
             List of ObjectionHandler objects.
         """
-        kx_text = self._format_sources(kx_sources)
-        competitor_text = self._format_sources(competitor_sources)
-
-        prompt = self.objection_template.format(
-            competitor_name=competitor_name,
-            kx_sources=kx_text,
-            competitor_sources=competitor_text,
-        )
+        params = self.objections_request(competitor_name, kx_sources, competitor_sources)
 
         logger.info("Generating cross-cutting objection handlers for %s", competitor_name)
 
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=4096,
-            system=self.system_prompt,
-            messages=[{"role": "user", "content": prompt}],
-        )
-
-        response_text = response.content[0].text
-        json_text = self._extract_json(response_text)
-
-        try:
-            data = json.loads(json_text)
-            if isinstance(data, dict):
-                data = data.get("objection_handlers", data.get("handlers", []))
-            if isinstance(data, list):
-                return [
-                    ObjectionHandler(**self._normalize_handler(item))
-                    for item in data
-                ]
-            else:
-                logger.error("Unexpected response structure for objection handlers")
-                return []
-        except (json.JSONDecodeError, Exception) as e:
-            logger.error("Failed to parse objection handlers: %s", e)
-            return []
+        return self.parse_objections(stream_text(self.client, params))
 
     def generate_cross_cutting(
         self,
@@ -106,29 +135,90 @@ class ObjectionGenerator:
         Returns:
             List of ObjectionHandler objects covering cross-cutting themes.
         """
+        params = self.cross_cutting_request(competitor_name, kx_sources, competitor_sources)
+
+        logger.info("Generating cross-cutting themes for %s", competitor_name)
+
+        return self.parse_cross_cutting(stream_text(self.client, params))
+
+    def objections_request(
+        self,
+        competitor_name: str,
+        kx_sources: list[SourceRecord],
+        competitor_sources: list[SourceRecord],
+    ) -> dict:
+        """Build messages.create params for the objection handler call."""
+        return self._request(
+            self.objection_template, competitor_name, kx_sources, competitor_sources
+        )
+
+    def cross_cutting_request(
+        self,
+        competitor_name: str,
+        kx_sources: list[SourceRecord],
+        competitor_sources: list[SourceRecord],
+    ) -> dict:
+        """Build messages.create params for the cross-cutting themes call."""
+        return self._request(
+            self.cross_cutting_template, competitor_name, kx_sources, competitor_sources
+        )
+
+    def _request(
+        self,
+        template: str,
+        competitor_name: str,
+        kx_sources: list[SourceRecord],
+        competitor_sources: list[SourceRecord],
+    ) -> dict:
         kx_text = self._format_sources(kx_sources)
         competitor_text = self._format_sources(competitor_sources)
 
-        prompt = self.cross_cutting_template.format(
+        sources_prompt = render_template(
+            self._sources_parts,
             competitor_name=competitor_name,
             kx_sources=kx_text,
             competitor_sources=competitor_text,
         )
+        prompt = template.format(competitor_name=competitor_name)
+
+        return {
+            "model": self.model,
+            "max_tokens": self.max_output_tokens,
+            "system": system_blocks(self.system_prompt),
+            # Prefill so the response starts as bare JSON, without fences
+            "messages": [
+                cached_user_message(sources_prompt, prompt),
+                prefill_message("["),
+            ],
+        }
+
+    def parse_objections(self, response_text: str) -> list[ObjectionHandler]:
+        """Parse an objection handler response into ObjectionHandler objects."""
+        json_text = self._extract_json(response_text)
 
-        logger.info("Generating cross-cutting themes for %s", competitor_name)
-
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=4096,
-            system=self.system_prompt,
-            messages=[{"role": "user", "content": prompt}],
-        )
+        try:
+            data = orjson.loads(json_text)
+            if isinstance(data, dict):
+                data = data.get("objection_handlers", data.get("handlers", []))
+            if isinstance(data, list):
+                return [
+                    _build_handler(self._normalize_handler(item))
+                    for item in data
+                ]
+            else:
+                logger.error("Unexpected response structure for objection handlers")
+                return []
+        except _PARSE_ERRORS as e:
+            logger.error("Failed to parse objection handlers: %s", e)
+            logger.warning("Response text: %.500s", response_text)
+            return []
 
-        response_text = response.content[0].text
+    def parse_cross_cutting(self, response_text: str) -> list[ObjectionHandler]:
+        """Parse a cross-cutting themes response into ObjectionHandler objects."""
         json_text = self._extract_json(response_text)
 
         try:
-            data = json.loads(json_text)
+            data = orjson.loads(json_text)
             if isinstance(data, dict):
                 # Try common wrapper keys
                 for key in ("objection_handlers", "handlers", "themes",
@@ -141,12 +231,13 @@ class ObjectionGenerator:
                     data = [data]
             if isinstance(data, list):
                 return [
-                    ObjectionHandler(**self._normalize_handler(item))
+                    _build_handler(self._normalize_handler(item))
                     for item in data
                 ]
             return []
-        except (json.JSONDecodeError, Exception) as e:
+        except _PARSE_ERRORS as e:
             logger.error("Failed to parse cross-cutting themes: %s", e)
+            logger.warning("Response text: %.500s", response_text)
             return []
 
     @staticmethod
@@ -157,83 +248,65 @@ class ObjectionGenerator:
         - 'theme' instead of 'objection'
         - 'rebuttal'/'counter'/'talking_points' instead of 'response'
         - nested 'kx_positioning'/'evidence' dicts instead of flat fields
+
+        Returns a new dict; the input is left untouched.
         """
-        # Map alternative field names → objection
-        if "objection" not in item:
-            for alt in ("theme", "concern", "pushback", "question"):
-                if alt in item:
-                    item["objection"] = item.pop(alt)
-                    break
-
-        # Map alternative field names → response
-        if "response" not in item:
-            for alt in ("rebuttal", "counter", "counter_argument",
-                        "talking_points", "kx_positioning"):
-                if alt in item:
-                    val = item.pop(alt)
-                    if isinstance(val, dict):
-                        # Flatten nested dict into a readable string
-                        item["response"] = "; ".join(
-                            f"{k}: {v}" for k, v in val.items()
-                            if isinstance(v, str)
-                        )
-                    elif isinstance(val, list):
-                        item["response"] = " ".join(str(v) for v in val)
-                    else:
-                        item["response"] = str(val)
-                    break
+        # Highest-priority alias present for each missing canonical field
+        chosen: dict[str, tuple[int, str]] = {}
+        for key in item:
+            alias = _HANDLER_ALIASES.get(key)
+            if alias is None:
+                continue
+            field, rank = alias
+            if field not in item and (field not in chosen or rank < chosen[field][0]):
+                chosen[field] = (rank, key)
+        renamed = {key: field for field, (_, key) in chosen.items()}
+
+        # Pull evidence out of nested structures
+        lift_evidence = "supporting_evidence" not in item
+
+        out = {}
+        for key, val in item.items():
+            field = renamed.get(key)
+            if field == "response":
+                out["response"] = _flatten_response(val)
+            elif field is not None:
+                out[field] = val
+            elif not (lift_evidence and key == "evidence"):
+                out[key] = val
 
         # Last resort: synthesize response from remaining fields
-        if "response" not in item:
-            item["response"] = item.get("objection", "See supporting evidence.")
+        if "response" not in out:
+            out["response"] = out.get("objection", "See supporting evidence.")
 
-        # Pull evidence out of nested structures
-        if "supporting_evidence" not in item:
-            evidence = item.pop("evidence", None)
+        if lift_evidence:
+            evidence = item.get("evidence")
             if isinstance(evidence, list):
-                item["supporting_evidence"] = [str(e) for e in evidence]
+                out["supporting_evidence"] = [str(e) for e in evidence]
             elif isinstance(evidence, dict):
-                item["supporting_evidence"] = [
+                out["supporting_evidence"] = [
                     f"{k}: {v}" for k, v in evidence.items()
                 ]
             elif isinstance(evidence, str):
-                item["supporting_evidence"] = [evidence]
+                out["supporting_evidence"] = [evidence]
 
-        return item
+        return out
 
     def _format_sources(self, records: list[SourceRecord]) -> str:
         """Format sources for prompt inclusion, truncating to fit."""
-        max_chars = self.max_source_tokens * 3  # Rough chars-to-tokens estimate
-
-        # Prioritize official and third-party sources
-        credibility_order = {"official": 0, "third_party": 1, "community": 2}
-        sorted_records = sorted(
-            records,
-            key=lambda r: credibility_order.get(r.credibility.value, 3),
-        )
+        # max_source_tokens covers both the KX and competitor lists
+        return format_sources(records, self.max_source_tokens // 2)
 
-        parts = []
-        total = 0
-        for record in sorted_records:
-            entry = (
-                f"### [{record.source_type.value}] {record.title}\n"
-                f"**URL**: {record.url}\n\n"
-                f"{record.text[:3000]}\n\n---\n\n"
-            )
-            if total + len(entry) > max_chars:
-                break
-            parts.append(entry)
-            total += len(entry)
-
-        return "".join(parts) if parts else "[No sources available]"
-
-    def _extract_json(self, text: str) -> str:
+    @staticmethod
+    def _extract_json(text: str) -> str:
         """Extract JSON from response text."""
-        import re
-        match = re.search(r"```(?:json)?\s*\n([\s\S]*?)\n```", text)
+        # Prefilled responses are already bare JSON
+        if text.startswith(("[", "{")) and text.rstrip().endswith(("]", "}")):
+            return text
+        match = _FENCE_RE.search(text)
         if match:
             return match.group(1)
-        match = re.search(r"[\[\{][\s\S]*[\]\}]", text)
+        match = _BARE_RE.search(text)
         if match:
             return match.group(0)
         return text
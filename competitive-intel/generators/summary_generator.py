@@ -5,14 +5,25 @@ and deal-stage talking points for a competitor. This runs after per-topic
 competitive entries have been generated.
 """
 
-import json
 import logging
+import re
 from datetime import date
-from pathlib import Path
 from typing import Optional
 
 import anthropic
-
+import orjson
+from pydantic import ValidationError
+
+from generators.common import (
+    cached_user_message,
+    format_sources,
+    load_prompt,
+    prefill_message,
+    render_template,
+    split_template,
+    stream_text,
+    system_blocks,
+)
 from schemas.competitive_entry import (
     ComparisonTable,
     CompetitiveEntry,
@@ -23,7 +34,11 @@ from schemas.source_record import SourceRecord
 
 logger = logging.getLogger(__name__)
 
-PROMPTS_DIR = Path(__file__).parent / "prompts"
+_FENCE_RE = re.compile(r"```(?:json)?\s*\n([\s\S]*?)\n```")
+_BARE_RE = re.compile(r"\{[\s\S]*\}")
+
+# What malformed LLM output can raise while parsing and building models
+_PARSE_ERRORS = (orjson.JSONDecodeError, AttributeError, TypeError, ValidationError)
 
 
 class SummaryGenerator:
@@ -33,13 +48,17 @@ class SummaryGenerator:
         self,
         model: str = "claude-sonnet-4-20250514",
         max_source_tokens: int = 80000,
+        max_output_tokens: int = 4096,
     ):
         self.client = anthropic.Anthropic()
         self.model = model
         self.max_source_tokens = max_source_tokens
+        self.max_output_tokens = max_output_tokens
 
-        self.system_prompt = (PROMPTS_DIR / "system_prompt.txt").read_text()
-        self.elevator_template = (PROMPTS_DIR / "elevator_pitch.txt").read_text()
+        self.system_prompt = load_prompt("system_prompt.txt")
+        # Pre-split: this template receives the large source blocks
+        self._sources_parts = split_template(load_prompt("source_documents.txt"))
+        self.elevator_template = load_prompt("elevator_pitch.txt")
 
     def generate_narrative(
         self,
@@ -59,33 +78,60 @@ class SummaryGenerator:
         Returns:
             PositioningNarrative with pitch, comparison table, and talking points.
         """
+        params = self.narrative_request(
+            competitor_name, kx_sources, competitor_sources, topic_entries
+        )
+
+        logger.info("Generating positioning narrative for %s", competitor_name)
+
+        # The narrative is a single JSON object; stop once it is complete
+        response_text = stream_text(self.client, params, stop_after_object=True)
+        return self.parse_narrative(response_text, competitor_name)
+
+    def narrative_request(
+        self,
+        competitor_name: str,
+        kx_sources: list[SourceRecord],
+        competitor_sources: list[SourceRecord],
+        topic_entries: list[CompetitiveEntry],
+    ) -> dict:
+        """Build messages.create params for the positioning narrative call."""
         # Summarize existing topic entries for context
         entries_summary = self._summarize_entries(topic_entries)
 
         kx_text = self._format_sources(kx_sources)
         competitor_text = self._format_sources(competitor_sources)
 
-        prompt = self.elevator_template.format(
+        sources_prompt = render_template(
+            self._sources_parts,
             competitor_name=competitor_name,
             kx_sources=kx_text,
             competitor_sources=competitor_text,
-            topic_entries_summary=entries_summary,
         )
-
-        logger.info("Generating positioning narrative for %s", competitor_name)
-
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=4096,
-            system=self.system_prompt,
-            messages=[{"role": "user", "content": prompt}],
+        prompt = self.elevator_template.format(
+            competitor_name=competitor_name,
+            topic_entries_summary=entries_summary,
         )
 
-        response_text = response.content[0].text
+        return {
+            "model": self.model,
+            "max_tokens": self.max_output_tokens,
+            "system": system_blocks(self.system_prompt),
+            # Prefill so the response starts as bare JSON, without fences
+            "messages": [
+                cached_user_message(sources_prompt, prompt),
+                prefill_message("{"),
+            ],
+        }
+
+    def parse_narrative(
+        self, response_text: str, competitor_name: str
+    ) -> PositioningNarrative:
+        """Parse a narrative response into a PositioningNarrative."""
         json_text = self._extract_json(response_text)
 
         try:
-            data = json.loads(json_text)
+            data = orjson.loads(json_text)
 
             # --- comparison_table: accept list of rows or {rows: [...]} ---
             ct = data.get("comparison_table", {})
@@ -128,8 +174,9 @@ class SummaryGenerator:
                 deal_stage_talking_points=DealStageTalkingPoints(**dstp),
                 model_used=self.model,
             )
-        except (json.JSONDecodeError, Exception) as e:
+        except _PARSE_ERRORS as e:
             logger.error("Failed to parse narrative response: %s", e)
+            logger.warning("Response text: %.500s", response_text)
             return PositioningNarrative(
                 competitor=competitor_name,
                 generated_date=date.today(),
@@ -189,35 +236,19 @@ class SummaryGenerator:
 
     def _format_sources(self, records: list[SourceRecord]) -> str:
         """Format sources for prompt, truncating to fit."""
-        max_chars = self.max_source_tokens * 3
-        credibility_order = {"official": 0, "third_party": 1, "community": 2}
-        sorted_records = sorted(
-            records,
-            key=lambda r: credibility_order.get(r.credibility.value, 3),
-        )
+        # max_source_tokens covers both the KX and competitor lists
+        return format_sources(records, self.max_source_tokens // 2)
 
-        parts = []
-        total = 0
-        for record in sorted_records:
-            entry = (
-                f"### [{record.source_type.value}] {record.title}\n"
-                f"**URL**: {record.url}\n\n"
-                f"{record.text[:2000]}\n\n---\n\n"
-            )
-            if total + len(entry) > max_chars:
-                break
-            parts.append(entry)
-            total += len(entry)
-
-        return "".join(parts) if parts else "[No sources available]"
-
-    def _extract_json(self, text: str) -> str:
+    @staticmethod
+    def _extract_json(text: str) -> str:
         """Extract JSON from response text."""
-        import re
-        match = re.search(r"```(?:json)?\s*\n([\s\S]*?)\n```", text)
+        # Prefilled responses are already bare JSON
+        if text.startswith("{") and text.rstrip().endswith("}"):
+            return text
+        match = _FENCE_RE.search(text)
         if match:
             return match.group(1)
-        match = re.search(r"\{[\s\S]*\}", text)
+        match = _BARE_RE.search(text)
         if match:
             return match.group(0)
         return text
@@ -24,12 +24,16 @@ Usage:
 """
 
 import argparse
-import json
 import logging
+import os
 import sys
+from collections import deque
 from datetime import date
+from functools import lru_cache
 from pathlib import Path
+from typing import Iterator, Optional
 
+import orjson
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -42,6 +46,10 @@ RAW_DIR = DATA_DIR / "raw"
 PROCESSED_DIR = DATA_DIR / "processed"
 GENERATED_DIR = DATA_DIR / "generated"
 REVIEWED_DIR = DATA_DIR / "reviewed"
+CACHE_DIR = DATA_DIR / "cache"  # compiled keyword databases
+
+RAW_READ_WORKERS = 32  # concurrent raw file reads in cmd_process
+
 
 class _FlushHandler(logging.StreamHandler):
     """StreamHandler that flushes after every emit (prevents buffering delays)."""
@@ -60,19 +68,23 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
 def load_competitor_config(name: str) -> dict:
-    """Load a competitor configuration file."""
+    """Load a competitor configuration file.
+
+    Cached for the life of the process; callers share the returned dict and
+    must not modify it.
+    """
     config_path = CONFIG_DIR / "competitors" / f"{name}.json"
     if not config_path.exists():
         raise FileNotFoundError(f"Competitor config not found: {config_path}")
-    with open(config_path) as f:
-        return json.load(f)
+    return orjson.loads(config_path.read_bytes())
 
 
+@lru_cache(maxsize=None)
 def load_taxonomy() -> dict:
-    """Load the taxonomy configuration."""
-    with open(CONFIG_DIR / "taxonomy.json") as f:
-        return json.load(f)
+    """Load the taxonomy configuration (cached, treat as read-only)."""
+    return orjson.loads((CONFIG_DIR / "taxonomy.json").read_bytes())
 
 
 def get_all_competitors() -> list[str]:
@@ -87,140 +99,267 @@ def get_all_competitors() -> list[str]:
 
 def cmd_scrape(args):
     """Run the scraping pipeline for specified targets."""
-    from scrapers.docs_scraper import scrape_docs
-    from scrapers.github_scraper import scrape_github
-    from scrapers.blog_scraper import scrape_blog
-    from scrapers.community_scraper import scrape_community
-    from scrapers.benchmark_scraper import scrape_benchmarks
+    import threading
 
     targets = get_all_competitors() if args.target == "all" else [args.target]
+    workers = min(len(targets), args.workers)
 
-    for target in targets:
-        logger.info("=" * 60)
-        logger.info("SCRAPING: %s", target)
-        logger.info("=" * 60)
+    # GitHub, Reddit and HN are shared across targets: hold a lock per API
+    # so concurrent targets don't multiply the request rate against them.
+    # Docs, blog and benchmark sites are per-target and run freely.
+    api_locks = {"github": threading.Lock(), "community": threading.Lock()}
 
-        config = load_competitor_config(target)
-        raw_dir = str(RAW_DIR)
+    if workers <= 1:
+        for target in targets:
+            _scrape_target(target, api_locks)
+        return
 
-        # Ensure output directories exist
-        target_raw = RAW_DIR / target
-        for subdir in ["docs", "blog", "github_issues", "github_discussions",
-                        "github_releases", "community", "benchmarks"]:
-            (target_raw / subdir).mkdir(parents=True, exist_ok=True)
+    from concurrent.futures import ThreadPoolExecutor
 
-        total_records = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_scrape_target, target, api_locks) for target in targets
+        ]
+        for future in futures:
+            future.result()
 
-        # 1. Scrape documentation
-        try:
-            docs_records = scrape_docs(config, raw_dir)
-            total_records += len(docs_records)
-            logger.info("  Docs: %d records", len(docs_records))
-        except Exception as e:
-            logger.error("  Docs scraping failed: %s", e)
 
-        # 2. Scrape GitHub
-        try:
-            github_records = scrape_github(config, raw_dir)
-            total_records += len(github_records)
-            logger.info("  GitHub: %d records", len(github_records))
-        except Exception as e:
-            logger.error("  GitHub scraping failed: %s", e)
+def _scrape_target(target: str, api_locks: dict):
+    """Run every scraper for one target."""
+    from contextlib import nullcontext
+    from scrapers.docs_scraper import scrape_docs
+    from scrapers.github_scraper import scrape_github
+    from scrapers.blog_scraper import scrape_blog
+    from scrapers.community_scraper import scrape_community
+    from scrapers.benchmark_scraper import scrape_benchmarks
+    from scrapers.utils import ensure_dir
 
-        # 3. Scrape blog
-        try:
-            blog_records = scrape_blog(config, raw_dir)
-            total_records += len(blog_records)
-            logger.info("  Blog: %d records", len(blog_records))
-        except Exception as e:
-            logger.error("  Blog scraping failed: %s", e)
+    logger.info("=" * 60)
+    logger.info("SCRAPING: %s", target)
+    logger.info("=" * 60)
 
-        # 4. Scrape community (Reddit + HN)
+    config = load_competitor_config(target)
+    raw_dir = str(RAW_DIR)
+
+    # Ensure output directories exist
+    target_raw = RAW_DIR / target
+    for subdir in ["docs", "blog", "github_issues", "github_discussions",
+                    "github_releases", "community", "benchmarks"]:
+        ensure_dir(target_raw / subdir)
+
+    total_records = 0
+    steps = [
+        ("Docs", scrape_docs, None),
+        ("GitHub", scrape_github, api_locks["github"]),
+        ("Blog", scrape_blog, None),
+        ("Community", scrape_community, api_locks["community"]),  # Reddit + HN
+        ("Benchmarks", scrape_benchmarks, None),
+    ]
+    for label, scrape, lock in steps:
         try:
-            community_records = scrape_community(config, raw_dir)
-            total_records += len(community_records)
-            logger.info("  Community: %d records", len(community_records))
+            with lock or nullcontext():
+                records = scrape(config, raw_dir)
+            total_records += len(records)
+            logger.info("  [%s] %s: %d records", target, label, len(records))
         except Exception as e:
-            logger.error("  Community scraping failed: %s", e)
+            logger.error("  [%s] %s scraping failed: %s", target, label, e)
+
+    logger.info("TOTAL for %s: %d records", target, total_records)
+
+    # Record per-file counts now so `status` needn't re-read the raw files
+    count_raw_records(target)
+
 
-        # 5. Scrape benchmarks
+def _iter_json_entries(root: Path) -> Iterator[os.DirEntry]:
+    """Yield a DirEntry for every *.json file under root, like rglob."""
+    pending = deque([root])
+    while pending:
         try:
-            benchmark_records = scrape_benchmarks(config, raw_dir)
-            total_records += len(benchmark_records)
-            logger.info("  Benchmarks: %d records", len(benchmark_records))
-        except Exception as e:
-            logger.error("  Benchmark scraping failed: %s", e)
+            entries = os.scandir(pending.popleft())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.name.endswith(".json") and entry.is_file():
+                    yield entry
+
+
+def count_raw_records(name: str) -> tuple[int, int]:
+    """Return (record count, file count) for a competitor's raw data.
+
+    Per-file record counts are kept in RAW_DIR/<name>.index.json keyed on
+    path, size and mtime, so only files changed since the last count are
+    re-read. The index sits outside the competitor's raw directory so raw
+    file globs never pick it up.
+    """
+    from scrapers.utils import load_json
+
+    raw_dir = RAW_DIR / name
+    index_path = RAW_DIR / f"{name}.index.json"
+    try:
+        index = orjson.loads(index_path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        index = {}
+
+    fresh = {}
+    for entry in _iter_json_entries(raw_dir):
+        stat = entry.stat()
+        rel_path = os.path.relpath(entry.path, raw_dir)
+        cached = index.get(rel_path)
+        if (
+            cached is not None
+            and cached["size"] == stat.st_size
+            and cached["mtime_ns"] == stat.st_mtime_ns
+        ):
+            fresh[rel_path] = cached
+            continue
+        try:
+            data = load_json(entry.path)
+            record_count = len(data) if isinstance(data, list) else 1
+        except Exception:
+            record_count = 0
+        fresh[rel_path] = {
+            "record_count": record_count,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    if fresh != index:
+        try:
+            index_path.write_bytes(orjson.dumps(fresh))
+        except OSError as e:
+            logger.warning("Could not write raw index %s: %s", index_path, e)
 
-        logger.info("TOTAL for %s: %d records", target, total_records)
+    return sum(f["record_count"] for f in fresh.values()), len(fresh)
 
 
 # ---------------------------------------------------------------------------
 # PROCESS
 # ---------------------------------------------------------------------------
 
-def cmd_process(args):
-    """Run the processing pipeline (tag, filter, dedup)."""
-    from processors.topic_tagger import TopicTagger
-    from processors.quality_filter import QualityFilter
-    from processors.deduplicator import Deduplicator
-    from processors.content_extractor import ContentExtractor
-    from schemas.source_record import SourceRecord
-    from scrapers.utils import load_records, save_records
+def _read_raw_file(path: Path):
+    """Read a raw file's bytes, returning the OSError instead of raising."""
+    try:
+        return path.read_bytes()
+    except OSError as e:
+        return e
 
-    targets = get_all_competitors() if args.target == "all" else [args.target]
 
-    for target in targets:
-        logger.info("=" * 60)
-        logger.info("PROCESSING: %s", target)
-        logger.info("=" * 60)
+def _load_raw_records(raw_target_dir: Path) -> list:
+    """Load and validate every raw JSON file under raw_target_dir.
 
-        config = load_competitor_config(target)
+    File reads run on a thread pool (reads release the GIL); the pool size
+    also caps how many files are open at once. Parsing stays on this thread.
+    A file holding an invalid record is validated item by item so only the
+    bad records are skipped.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from pydantic import ValidationError
+    from schemas.source_record import SourceRecord
+    from scrapers.utils import parse_source_records
 
-        # Load all raw records for this target
-        raw_target_dir = RAW_DIR / target
-        all_records = []
+    json_files = list(raw_target_dir.rglob("*.json"))
+    all_records = []
 
-        for json_file in raw_target_dir.rglob("*.json"):
+    with ThreadPoolExecutor(max_workers=RAW_READ_WORKERS) as executor:
+        for json_file, raw in zip(json_files, executor.map(_read_raw_file, json_files)):
             try:
-                data = load_records(str(json_file))
-                for item in data:
-                    record = SourceRecord(**item)
-                    all_records.append(record)
+                if isinstance(raw, OSError):
+                    raise raw
+                # Validate the whole file in one pydantic-core pass; only a
+                # file holding an invalid record goes item by item
+                try:
+                    all_records.extend(parse_source_records(raw))
+                except ValidationError:
+                    data = orjson.loads(raw)
+                    items = data if isinstance(data, list) else [data]
+                    for item in items:
+                        try:
+                            all_records.append(SourceRecord(**item))
+                        except Exception as e:
+                            logger.debug("Skipping invalid record in %s: %s", json_file.name, e)
             except Exception as e:
                 logger.error("Failed to load %s: %s", json_file, e)
 
-        logger.info("Loaded %d raw records for %s", len(all_records), target)
+    return all_records
 
-        if not all_records:
-            logger.warning("No raw records found for %s, skipping", target)
-            continue
 
-        # Step 1: Clean content
-        extractor = ContentExtractor()
-        all_records = extractor.clean_batch(all_records)
+def cmd_process(args):
+    """Run the processing pipeline (tag, filter, dedup)."""
+    targets = get_all_competitors() if args.target == "all" else [args.target]
+    workers = min(len(targets), args.workers or os.cpu_count() or 1)
+
+    if workers <= 1:
+        for target in targets:
+            _process_target(target)
+        return
 
-        # Step 2: Tag topics
-        competitor_keywords = config.get("topic_keywords", {})
-        tagger = TopicTagger(
-            global_keywords_path=str(CONFIG_DIR / "keywords.json"),
-            competitor_keywords=competitor_keywords,
-        )
-        all_records = tagger.tag_batch(all_records)
+    # Targets are independent and CPU-bound: one process each, with the
+    # cores split between them for the per-target cleaning and dedup pools
+    from concurrent.futures import ProcessPoolExecutor
+
+    clean_workers = max(1, (os.cpu_count() or 1) // workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_process_target, target, clean_workers)
+            for target in targets
+        ]
+        for future in futures:
+            future.result()
+
+
+def _process_target(target: str, clean_workers: Optional[int] = None):
+    """Clean, tag, filter and dedup one target's raw records and save them."""
+    from processors.topic_tagger import TopicTagger
+    from processors.quality_filter import QualityFilter
+    from processors.deduplicator import Deduplicator
+    from processors.content_extractor import ContentExtractor
+    from scrapers.utils import ensure_dir, save_records
+
+    logger.info("=" * 60)
+    logger.info("PROCESSING: %s", target)
+    logger.info("=" * 60)
 
-        # Step 3: Quality filter
-        quality_filter = QualityFilter()
-        all_records = quality_filter.filter(all_records)
+    config = load_competitor_config(target)
 
-        # Step 4: Deduplicate
-        deduplicator = Deduplicator()
-        all_records = deduplicator.deduplicate(all_records)
+    # Load all raw records for this target
+    all_records = _load_raw_records(RAW_DIR / target)
 
-        # Save processed records
-        output_dir = str(PROCESSED_DIR / target)
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
-        save_records(all_records, output_dir, f"{target}_processed.json")
+    logger.info("Loaded %d raw records for %s", len(all_records), target)
 
-        logger.info("PROCESSED %s: %d records saved", target, len(all_records))
+    if not all_records:
+        logger.warning("No raw records found for %s, skipping", target)
+        return
+
+    # Each record flows through clean → tag → quality → dedup in turn;
+    # only the survivors are collected.
+    extractor = ContentExtractor()
+    competitor_keywords = config.get("topic_keywords", {})
+    tagger = TopicTagger(
+        global_keywords_path=str(CONFIG_DIR / "keywords.json"),
+        competitor_keywords=competitor_keywords,
+        database_cache_dir=str(CACHE_DIR),
+    )
+    quality_filter = QualityFilter()
+    deduplicator = Deduplicator()
+
+    all_records = list(
+        deduplicator.deduplicate_stream(
+            quality_filter.filter_stream(
+                tagger.tag_stream(extractor.clean_stream(all_records, clean_workers))
+            ),
+            clean_workers,
+        )
+    )
+
+    # Save processed records
+    output_dir = str(PROCESSED_DIR / target)
+    ensure_dir(output_dir)
+    save_records(all_records, output_dir, f"{target}_processed.json")
+
+    logger.info("PROCESSED %s: %d records saved", target, len(all_records))
 
 
 # ---------------------------------------------------------------------------
@@ -230,10 +369,9 @@ def cmd_process(args):
 def cmd_generate(args):
     """Run the LLM generation pipeline."""
     from generators.comparison_generator import ComparisonGenerator
-    from generators.objection_generator import ObjectionGenerator
-    from generators.summary_generator import SummaryGenerator
-    from schemas.source_record import SourceRecord
-    from scrapers.utils import load_records, save_records
+    from scrapers.utils import (
+        ensure_dir, load_records, load_source_records, save_records,
+    )
 
     competitor = args.competitor
     topic_filter = args.topic
@@ -246,20 +384,14 @@ def cmd_generate(args):
 
     taxonomy = load_taxonomy()
 
-    # Load processed KX records
+    # Load processed KX records, validated in one pass per file
     kx_path = PROCESSED_DIR / "kx" / "kx_processed.json"
-    kx_records = []
-    if kx_path.exists():
-        for item in load_records(str(kx_path)):
-            kx_records.append(SourceRecord(**item))
+    kx_records = load_source_records(str(kx_path))
     logger.info("Loaded %d processed KX records", len(kx_records))
 
     # Load processed competitor records
     comp_path = PROCESSED_DIR / competitor / f"{competitor}_processed.json"
-    comp_records = []
-    if comp_path.exists():
-        for item in load_records(str(comp_path)):
-            comp_records.append(SourceRecord(**item))
+    comp_records = load_source_records(str(comp_path))
     logger.info("Loaded %d processed %s records", len(comp_records), competitor)
 
     if not kx_records and not comp_records:
@@ -270,7 +402,7 @@ def cmd_generate(args):
     competitor_name = config["name"]
 
     output_dir = GENERATED_DIR / competitor
-    output_dir.mkdir(parents=True, exist_ok=True)
+    ensure_dir(output_dir)
 
     # Determine which steps to run (default: all)
     run_topics = step in (None, "topics")
@@ -306,49 +438,150 @@ def cmd_generate(args):
                 entries.append(CompetitiveEntry(**item))
             logger.info("Loaded %d existing topic entries from disk", len(entries))
 
-    # Step 2: Generate cross-cutting objection handlers
-    if run_objections:
-        obj_gen = ObjectionGenerator()
+    # Steps 2 and 3 only read the records and topic entries, so run them
+    # concurrently. Objections and cross-cutting share one worker so the
+    # second call hits the prompt cache written by the first.
+    if getattr(args, "batch", False) and (run_objections or run_narrative):
+        _generate_batched(
+            competitor, competitor_name, kx_records, comp_records, entries,
+            output_dir, run_objections, run_narrative,
+        )
+        logger.info("GENERATION COMPLETE for %s", competitor)
+        return
 
-        objections = obj_gen.generate_objections(
-            competitor_name=competitor_name,
-            kx_sources=kx_records,
-            competitor_sources=comp_records,
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = []
+        if run_objections:
+            futures.append(executor.submit(
+                _generate_objection_steps,
+                competitor, competitor_name, kx_records, comp_records, output_dir,
+            ))
+        if run_narrative:
+            futures.append(executor.submit(
+                _generate_narrative_step,
+                competitor, competitor_name, kx_records, comp_records, entries,
+                output_dir,
+            ))
+        for future in futures:
+            future.result()
+
+    logger.info("GENERATION COMPLETE for %s", competitor)
+
+
+def _generate_objection_steps(
+    competitor, competitor_name, kx_records, comp_records, output_dir
+):
+    """Step 2: Generate cross-cutting objection handlers and themes."""
+    from generators.objection_generator import ObjectionGenerator
+
+    obj_gen = ObjectionGenerator()
+
+    objections = obj_gen.generate_objections(
+        competitor_name=competitor_name,
+        kx_sources=kx_records,
+        competitor_sources=comp_records,
+    )
+    _save_objections(objections, competitor, output_dir)
+
+    cross_cutting = obj_gen.generate_cross_cutting(
+        competitor_name=competitor_name,
+        kx_sources=kx_records,
+        competitor_sources=comp_records,
+    )
+    _save_cross_cutting(cross_cutting, competitor, output_dir)
+
+
+def _generate_narrative_step(
+    competitor, competitor_name, kx_records, comp_records, entries, output_dir
+):
+    """Step 3: Generate the positioning narrative."""
+    from generators.summary_generator import SummaryGenerator
+
+    sum_gen = SummaryGenerator()
+    narrative = sum_gen.generate_narrative(
+        competitor_name=competitor_name,
+        kx_sources=kx_records,
+        competitor_sources=comp_records,
+        topic_entries=entries,
+    )
+    _save_narrative(narrative, competitor, output_dir)
+
+
+def _generate_batched(
+    competitor, competitor_name, kx_records, comp_records, entries, output_dir,
+    run_objections, run_narrative,
+):
+    """Steps 2-3 via one Message Batches submission (half price, slow)."""
+    from generators.batch_runner import BatchRunner
+    from generators.objection_generator import ObjectionGenerator
+    from generators.summary_generator import SummaryGenerator
+
+    obj_gen = ObjectionGenerator()
+    sum_gen = SummaryGenerator()
+
+    requests = {}
+    if run_objections:
+        requests["objections"] = obj_gen.objections_request(
+            competitor_name, kx_records, comp_records
+        )
+        requests["cross_cutting"] = obj_gen.cross_cutting_request(
+            competitor_name, kx_records, comp_records
+        )
+    if run_narrative:
+        requests["narrative"] = sum_gen.narrative_request(
+            competitor_name, kx_records, comp_records, entries
         )
-        if objections:
-            save_records(
-                objections, str(output_dir), f"{competitor}_objection_handlers.json"
-            )
-            logger.info("Generated %d objection handlers", len(objections))
 
-        cross_cutting = obj_gen.generate_cross_cutting(
-            competitor_name=competitor_name,
-            kx_sources=kx_records,
-            competitor_sources=comp_records,
+    logger.info("Submitting %d generation requests as a message batch", len(requests))
+    texts = BatchRunner().submit_and_poll(requests)
+
+    # Failed requests come back as None: leave their existing output files
+    # alone rather than overwriting them with a failure placeholder
+    failed = [custom_id for custom_id, text in texts.items() if text is None]
+    if failed:
+        logger.error("Batch requests failed, keeping previous output: %s", ", ".join(failed))
+
+    if texts.get("objections") is not None:
+        _save_objections(obj_gen.parse_objections(texts["objections"]), competitor, output_dir)
+    if texts.get("cross_cutting") is not None:
+        _save_cross_cutting(
+            obj_gen.parse_cross_cutting(texts["cross_cutting"]), competitor, output_dir
+        )
+    if texts.get("narrative") is not None:
+        _save_narrative(
+            sum_gen.parse_narrative(texts["narrative"], competitor_name),
+            competitor, output_dir,
         )
-        if cross_cutting:
-            save_records(
-                cross_cutting, str(output_dir), f"{competitor}_cross_cutting.json"
-            )
-            logger.info("Generated %d cross-cutting handlers", len(cross_cutting))
 
-    # Step 3: Generate positioning narrative
-    if run_narrative:
-        sum_gen = SummaryGenerator()
-        narrative = sum_gen.generate_narrative(
-            competitor_name=competitor_name,
-            kx_sources=kx_records,
-            competitor_sources=comp_records,
-            topic_entries=entries,
+
+def _save_objections(objections, competitor, output_dir):
+    from scrapers.utils import save_records
+
+    if objections:
+        save_records(
+            objections, str(output_dir), f"{competitor}_objection_handlers.json"
         )
-        import orjson
-        narrative_path = output_dir / f"{competitor}_narrative.json"
-        narrative_path.write_bytes(
-            orjson.dumps(narrative.model_dump(mode="json"), option=orjson.OPT_INDENT_2)
+        logger.info("Generated %d objection handlers", len(objections))
+
+
+def _save_cross_cutting(cross_cutting, competitor, output_dir):
+    from scrapers.utils import save_records
+
+    if cross_cutting:
+        save_records(
+            cross_cutting, str(output_dir), f"{competitor}_cross_cutting.json"
         )
-        logger.info("Generated positioning narrative")
+        logger.info("Generated %d cross-cutting handlers", len(cross_cutting))
 
-    logger.info("GENERATION COMPLETE for %s", competitor)
+
+def _save_narrative(narrative, competitor, output_dir):
+    narrative_path = output_dir / f"{competitor}_narrative.json"
+    narrative_path.write_bytes(
+        orjson.dumps(narrative.model_dump(mode="json"), option=orjson.OPT_INDENT_2)
+    )
+    logger.info("Generated positioning narrative")
 
 
 # ---------------------------------------------------------------------------
@@ -357,70 +590,139 @@ def cmd_generate(args):
 
 def cmd_status(args):
     """Show the current status of the pipeline for all competitors."""
+    from concurrent.futures import ThreadPoolExecutor
+
     competitors = get_all_competitors()
 
-    print("\n" + "=" * 70)
-    print("COMPETITIVE INTELLIGENCE PIPELINE STATUS")
-    print("=" * 70)
+    # Collected and written once at the end rather than printed line by line
+    lines: list[str] = []
+    lines.append("\n" + "=" * 70)
+    lines.append("COMPETITIVE INTELLIGENCE PIPELINE STATUS")
+    lines.append("=" * 70)
 
-    for comp in competitors:
-        config = load_competitor_config(comp)
-        print(f"\n--- {config['name']} ({comp}) ---")
-        print(f"  Type: {'Self (KX)' if config.get('is_self') else 'Competitor'}")
+    # Competitors are checked concurrently (mostly stat calls); map keeps order
+    with ThreadPoolExecutor(max_workers=max(1, min(len(competitors), 8))) as executor:
+        for comp_lines in executor.map(_status_lines, competitors):
+            lines.extend(comp_lines)
 
-        # Check raw data
-        raw_dir = RAW_DIR / comp
-        raw_files = list(raw_dir.rglob("*.json")) if raw_dir.exists() else []
-        raw_count = 0
-        for f in raw_files:
-            try:
-                import orjson
-                data = orjson.loads(f.read_bytes())
-                raw_count += len(data) if isinstance(data, list) else 1
-            except Exception:
-                pass
-        print(f"  Raw records: {raw_count} ({len(raw_files)} files)")
-
-        # Check processed data
-        proc_file = PROCESSED_DIR / comp / f"{comp}_processed.json"
-        if proc_file.exists():
-            try:
-                import orjson
-                data = orjson.loads(proc_file.read_bytes())
-                print(f"  Processed records: {len(data)}")
-            except Exception:
-                print("  Processed records: [error reading]")
-        else:
-            print("  Processed records: 0 (not yet processed)")
-
-        # Check generated data
-        gen_dir = GENERATED_DIR / comp
-        if gen_dir.exists():
-            gen_files = list(gen_dir.glob("*.json"))
-            print(f"  Generated files: {len(gen_files)}")
-            for gf in gen_files:
-                print(f"    - {gf.name}")
-        else:
-            print("  Generated files: 0 (not yet generated)")
-
-        # Check reviewed data
-        rev_dir = REVIEWED_DIR / comp
-        if rev_dir.exists():
-            rev_files = list(rev_dir.glob("*.json"))
-            print(f"  Reviewed files: {len(rev_files)}")
-        else:
-            print("  Reviewed files: 0 (not yet reviewed)")
+    lines.append("\n" + "=" * 70)
 
-    print("\n" + "=" * 70)
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _status_lines(comp: str) -> list[str]:
+    """Build the status report lines for one competitor."""
+    from scrapers.utils import count_records
+
+    lines: list[str] = []
+    config = load_competitor_config(comp)
+    lines.append(f"\n--- {config['name']} ({comp}) ---")
+    lines.append(f"  Type: {'Self (KX)' if config.get('is_self') else 'Competitor'}")
+
+    # Check raw data
+    raw_count, raw_file_count = count_raw_records(comp)
+    lines.append(f"  Raw records: {raw_count} ({raw_file_count} files)")
+
+    # Check processed data
+    proc_file = PROCESSED_DIR / comp / f"{comp}_processed.json"
+    if proc_file.exists():
+        try:
+            lines.append(f"  Processed records: {count_records(str(proc_file))}")
+        except Exception:
+            lines.append("  Processed records: [error reading]")
+    else:
+        lines.append("  Processed records: 0 (not yet processed)")
+
+    # Check generated data
+    gen_dir = GENERATED_DIR / comp
+    if gen_dir.exists():
+        gen_files = list(gen_dir.glob("*.json"))
+        lines.append(f"  Generated files: {len(gen_files)}")
+        for gf in gen_files:
+            lines.append(f"    - {gf.name}")
+    else:
+        lines.append("  Generated files: 0 (not yet generated)")
+
+    # Check reviewed data
+    rev_dir = REVIEWED_DIR / comp
+    if rev_dir.exists():
+        rev_files = list(rev_dir.glob("*.json"))
+        lines.append(f"  Reviewed files: {len(rev_files)}")
+    else:
+        lines.append("  Reviewed files: 0 (not yet reviewed)")
+
+    return lines
 
 
 # ---------------------------------------------------------------------------
 # EXPORT
 # ---------------------------------------------------------------------------
 
+def _format_topic_entry(entry: dict, competitor_name: str) -> Iterator[str]:
+    """Yield the review-document lines for one per-topic entry."""
+    yield f"### {entry.get('topic_name', 'Unknown Topic')}"
+    yield f"**Topic ID**: {entry.get('topic_id', '')}"
+    yield f"**Confidence**: {entry.get('confidence', 'unknown')}"
+    yield f"**Sources Used**: {entry.get('source_count', 0)}"
+    yield ""
+
+    # Assessment
+    assessment = entry.get("competitor_assessment", {})
+    yield f"**{competitor_name} Assessment**: {assessment.get('summary', 'N/A')}"
+    strengths = assessment.get("strengths", [])
+    if strengths:
+        yield "**Strengths**:"
+        for s in strengths:
+            yield f"  - {s}"
+    yield ""
+
+    # Limitations
+    limitations = entry.get("competitor_limitations", [])
+    if limitations:
+        yield f"**{competitor_name} Limitations**:"
+        for lim in limitations:
+            yield f"  - [{lim.get('evidence_type', '?')}] {lim.get('limitation', '')}"
+        yield ""
+
+    # Differentiators
+    diffs = entry.get("kx_differentiators", [])
+    if diffs:
+        yield "**KX Differentiators**:"
+        for d in diffs:
+            yield f"  - {d.get('differentiator', '')}: {d.get('explanation', '')}"
+        yield ""
+
+    # Elevator pitch
+    pitch = entry.get("elevator_pitch", {})
+    yield f"**Elevator Pitch**: {pitch.get('pitch', 'N/A')}"
+    if pitch.get("key_stat"):
+        yield f"**Key Stat**: {pitch['key_stat']}"
+    yield ""
+
+    # Gaps
+    gaps = entry.get("gaps", [])
+    if gaps:
+        yield "**GAPS (needs manual research)**:"
+        for g in gaps:
+            yield f"  - {g}"
+        yield ""
+
+    yield "-" * 50
+    yield ""
+
+
+def _format_objection(obj: dict) -> Iterator[str]:
+    """Yield the review-document lines for one objection handler."""
+    yield f"**Q**: {obj.get('objection', 'N/A')}"
+    yield f"**A**: {obj.get('response', 'N/A')}"
+    yield ""
+
+
 def cmd_export(args):
     """Export generated data as a human-readable review document."""
-    from scrapers.utils import load_records
+    import shutil
+    import tempfile
+    from scrapers.utils import ensure_dir, iter_records, load_json
 
     competitor = args.competitor
     config = load_competitor_config(competitor)
@@ -428,104 +730,67 @@ def cmd_export(args):
 
     gen_dir = GENERATED_DIR / competitor
     export_dir = REVIEWED_DIR / competitor
-    export_dir.mkdir(parents=True, exist_ok=True)
-
-    output_lines = []
-    output_lines.append(f"# Competitive Intelligence Review: KX vs {competitor_name}")
-    output_lines.append(f"Generated: {date.today()}")
-    output_lines.append("=" * 70)
-    output_lines.append("")
-
-    # Load topic entries
-    entries_file = gen_dir / f"{competitor}_topic_entries.json"
-    if entries_file.exists():
-        entries = load_records(str(entries_file))
-        output_lines.append(f"## Per-Topic Analysis ({len(entries)} topics)")
-        output_lines.append("")
-
-        for entry in entries:
-            output_lines.append(f"### {entry.get('topic_name', 'Unknown Topic')}")
-            output_lines.append(f"**Topic ID**: {entry.get('topic_id', '')}")
-            output_lines.append(f"**Confidence**: {entry.get('confidence', 'unknown')}")
-            output_lines.append(f"**Sources Used**: {entry.get('source_count', 0)}")
-            output_lines.append("")
-
-            # Assessment
-            assessment = entry.get("competitor_assessment", {})
-            output_lines.append(f"**{competitor_name} Assessment**: {assessment.get('summary', 'N/A')}")
-            strengths = assessment.get("strengths", [])
-            if strengths:
-                output_lines.append("**Strengths**:")
-                for s in strengths:
-                    output_lines.append(f"  - {s}")
-            output_lines.append("")
-
-            # Limitations
-            limitations = entry.get("competitor_limitations", [])
-            if limitations:
-                output_lines.append(f"**{competitor_name} Limitations**:")
-                for lim in limitations:
-                    output_lines.append(
-                        f"  - [{lim.get('evidence_type', '?')}] {lim.get('limitation', '')}"
-                    )
-                output_lines.append("")
-
-            # Differentiators
-            diffs = entry.get("kx_differentiators", [])
-            if diffs:
-                output_lines.append("**KX Differentiators**:")
-                for d in diffs:
-                    output_lines.append(f"  - {d.get('differentiator', '')}: {d.get('explanation', '')}")
-                output_lines.append("")
-
-            # Elevator pitch
-            pitch = entry.get("elevator_pitch", {})
-            output_lines.append(f"**Elevator Pitch**: {pitch.get('pitch', 'N/A')}")
-            if pitch.get("key_stat"):
-                output_lines.append(f"**Key Stat**: {pitch['key_stat']}")
-            output_lines.append("")
-
-            # Gaps
-            gaps = entry.get("gaps", [])
-            if gaps:
-                output_lines.append("**GAPS (needs manual research)**:")
-                for g in gaps:
-                    output_lines.append(f"  - {g}")
-                output_lines.append("")
-
-            output_lines.append("-" * 50)
-            output_lines.append("")
-
-    # Load narrative
-    narrative_file = gen_dir / f"{competitor}_narrative.json"
-    if narrative_file.exists():
-        try:
-            import orjson
-            narrative = orjson.loads(narrative_file.read_bytes())
-            output_lines.append("## Overall Positioning Narrative")
-            output_lines.append("")
-            output_lines.append(
-                f"**60-Second Pitch**: {narrative.get('sixty_second_pitch', 'N/A')}"
-            )
-            output_lines.append("")
-        except Exception as e:
-            output_lines.append(f"## Narrative: [Error loading: {e}]")
-            output_lines.append("")
-
-    # Load objection handlers
-    objections_file = gen_dir / f"{competitor}_objection_handlers.json"
-    if objections_file.exists():
-        objections = load_records(str(objections_file))
-        output_lines.append(f"## Objection Handlers ({len(objections)} handlers)")
-        output_lines.append("")
-        for obj in objections:
-            output_lines.append(f"**Q**: {obj.get('objection', 'N/A')}")
-            output_lines.append(f"**A**: {obj.get('response', 'N/A')}")
-            output_lines.append("")
-
-    # Write export file
+    ensure_dir(export_dir)
+
+    # Lines are written as they are formatted rather than collected first
     export_path = export_dir / f"{competitor}_review_{date.today()}.txt"
-    export_path.write_text("\n".join(output_lines))
+    with open(export_path, "w", buffering=1 << 20) as out:
+
+        def write_lines(lines):
+            out.writelines(f"{line}\n" for line in lines)
+
+        def write_section(heading, records_file, format_record):
+            """Write a record file's section, counting records in the same pass.
+
+            The heading needs the count, so the body is spooled (to disk once
+            it gets large) and copied out after the heading.
+            """
+            count = 0
+            with tempfile.SpooledTemporaryFile(max_size=1 << 22, mode="w+") as body:
+                for record in iter_records(str(records_file)):
+                    body.writelines(f"{line}\n" for line in format_record(record))
+                    count += 1
+                write_lines([heading.format(count=count), ""])
+                body.seek(0)
+                shutil.copyfileobj(body, out)
+
+        write_lines([
+            f"# Competitive Intelligence Review: KX vs {competitor_name}",
+            f"Generated: {date.today()}",
+            "=" * 70,
+            "",
+        ])
+
+        # Load topic entries
+        entries_file = gen_dir / f"{competitor}_topic_entries.json"
+        if entries_file.exists():
+            write_section(
+                "## Per-Topic Analysis ({count} topics)", entries_file,
+                lambda entry: _format_topic_entry(entry, competitor_name),
+            )
+
+        # Load narrative
+        narrative_file = gen_dir / f"{competitor}_narrative.json"
+        if narrative_file.exists():
+            try:
+                narrative = load_json(narrative_file)
+                write_lines([
+                    "## Overall Positioning Narrative",
+                    "",
+                    f"**60-Second Pitch**: {narrative.get('sixty_second_pitch', 'N/A')}",
+                    "",
+                ])
+            except Exception as e:
+                write_lines([f"## Narrative: [Error loading: {e}]", ""])
+
+        # Load objection handlers
+        objections_file = gen_dir / f"{competitor}_objection_handlers.json"
+        if objections_file.exists():
+            write_section(
+                "## Objection Handlers ({count} handlers)", objections_file,
+                _format_objection,
+            )
+
     logger.info("Exported review document to %s", export_path)
     print(f"\nExported to: {export_path}")
 
@@ -651,6 +916,12 @@ def main():
         required=True,
         help="Competitor short name or 'all'",
     )
+    scrape_parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Targets scraped concurrently with --target all (default: 4)",
+    )
 
     # Process
     process_parser = subparsers.add_parser("process", help="Process scraped data")
@@ -659,6 +930,12 @@ def main():
         required=True,
         help="Competitor short name or 'all'",
     )
+    process_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Targets processed in parallel with --target all (default: CPU count)",
+    )
 
     # Generate
     generate_parser = subparsers.add_parser("generate", help="Generate competitive entries")
@@ -683,6 +960,12 @@ def main():
         default=None,
         help="Run only a specific generation step (skips the others)",
     )
+    generate_parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Send objection/narrative calls via the Message Batches API "
+             "(half price, may take hours)",
+    )
 
     # Status
     subparsers.add_parser("status", help="Show pipeline status")
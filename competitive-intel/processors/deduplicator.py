@@ -2,39 +2,265 @@
 
 Handles three levels of deduplication:
 1. Exact URL dedup — same URL from different search terms/scrapers
-2. Near-duplicate text detection using MinHash (datasketch)
+2. Near-duplicate text detection using one-permutation MinHash + banded LSH
 3. GitHub-specific dedup by issue/discussion number
 """
 
+import hashlib
 import logging
-from typing import Optional
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable, Iterator, Optional
 
-from datasketch import MinHash, MinHashLSH
+import numpy as np
 
 from schemas.source_record import SourceRecord, SourceType
 
 logger = logging.getLogger(__name__)
 
+# Odd 64-bit multipliers mixing the three word hashes of a shingle, so
+# word order matters ("a b c" != "c b a")
+_SHINGLE_MULTIPLIERS = (
+    np.uint64(0x9E3779B97F4A7C15),
+    np.uint64(0xC2B2AE3D27D4EB4F),
+    np.uint64(0x165667B19E3779F9),
+)
+# splitmix64/murmur3 fmix64 finalizer constants
+_FMIX_1 = np.uint64(0xFF51AFD7ED558CCD)
+_FMIX_2 = np.uint64(0xC4CEB9FE1A85EC53)
+
+# Marks a signature bin no shingle hashed into. Bin values are
+# hash // num_perm, so no real value reaches it.
+_EMPTY_BIN = np.uint64(np.iinfo(np.uint64).max)
+
+# Probe steps taken per densification round
+DENSIFY_PROBES = 16
+
+# Below this many records, process pool startup costs more than it saves
+PARALLEL_MIN_RECORDS = 256
+
+# Texts each pool task signs into the shared signature matrix
+SIGNATURE_CHUNK_SIZE = 64
+
+# Low 32 bits of a band hash, the first Bloom filter probe
+_LOW_32 = np.uint64(0xFFFFFFFF)
+
+# Per-process deduplicator for pool workers, so word hashes are cached
+_worker_deduplicator: Optional["Deduplicator"] = None
+
+
+def _signature_worker(
+    shm_name: str, start: int, texts_lower: list[str], num_perm: int
+) -> None:
+    """Write the signatures of texts_lower into rows start.. of the shared matrix."""
+    global _worker_deduplicator
+    if _worker_deduplicator is None or _worker_deduplicator.num_perm != num_perm:
+        _worker_deduplicator = Deduplicator(num_perm=num_perm)
+    shm = SharedMemory(name=shm_name)
+    sigs = np.ndarray(
+        (start + len(texts_lower), num_perm), dtype=np.uint64, buffer=shm.buf
+    )
+    try:
+        for row, text_lower in enumerate(texts_lower, start):
+            sigs[row] = _worker_deduplicator._signature(text_lower)
+    finally:
+        del sigs  # The block can't be closed while a view of it exists
+        shm.close()
+
+
+def _mix64(h: np.ndarray) -> np.ndarray:
+    """Apply the fmix64 finalizer to a uint64 array in place."""
+    h ^= h >> np.uint64(33)
+    h *= _FMIX_1
+    h ^= h >> np.uint64(33)
+    h *= _FMIX_2
+    h ^= h >> np.uint64(33)
+    return h
+
+
+@lru_cache(maxsize=None)
+def _probe_bins(num_perm: int, first_attempt: int) -> np.ndarray:
+    """Return the (num_perm, DENSIFY_PROBES) bins each bin probes in one round.
+
+    Probe order depends only on the bin and attempt number, never on the
+    text, so each round's table is built once per process and shared.
+    """
+    attempts = np.arange(
+        first_attempt, first_attempt + DENSIFY_PROBES, dtype=np.uint64
+    )
+    keys = np.arange(num_perm, dtype=np.uint64) * _SHINGLE_MULTIPLIERS[0]
+    probes = (_mix64(keys[:, None] + attempts) % np.uint64(num_perm)).astype(np.intp)
+    probes.setflags(write=False)
+    return probes
+
+
+def _row_salts(rows: int) -> np.ndarray:
+    """Per-row salts, so permuting values within a band changes its hash."""
+    return _mix64(np.arange(1, rows + 1, dtype=np.uint64) * _SHINGLE_MULTIPLIERS[1])
+
+
+def _band_hashes(sig: np.ndarray, num_bands: int, row_salts: np.ndarray) -> np.ndarray:
+    """Hash each of the first num_bands bands of sig to a uint64."""
+    rows = sig[: num_bands * len(row_salts)].reshape(num_bands, len(row_salts))
+    mixed = _mix64(rows ^ row_salts)
+    return _mix64(np.bitwise_xor.reduce(mixed, axis=1))
+
+
+@lru_cache(maxsize=None)
+def _optimal_bands(threshold: float, num_perm: int) -> tuple[int, int]:
+    """Pick (bands, rows) minimizing false positive + false negative rates.
+
+    Same criterion as datasketch's MinHashLSH with equal weights: a pair
+    with similarity s shares some band with probability 1 - (1 - s^r)^b,
+    and the error areas below and above the threshold are integrated
+    numerically (midpoint rule).
+    """
+    steps = 1000
+    below = (np.arange(steps) + 0.5) * (threshold / steps)
+    above = threshold + (np.arange(steps) + 0.5) * ((1.0 - threshold) / steps)
+    best, best_error = (1, 1), float("inf")
+    for b in range(1, num_perm + 1):
+        for r in range(1, num_perm // b + 1):
+            false_pos = (1 - (1 - below**r) ** b).mean() * threshold
+            false_neg = ((1 - above**r) ** b).mean() * (1.0 - threshold)
+            error = false_pos + false_neg
+            if error < best_error:
+                best, best_error = (b, r), error
+    return best
+
+
+class BandedLSH:
+    """In-memory banded LSH index over signatures, for one dedup run.
+
+    Each band of a signature is hashed to a 32-bit int key; records sharing
+    a key in any band are candidate near-duplicates. Int keys keep the
+    buckets much smaller than datasketch's bytes-keyed storage.
+    """
+
+    def __init__(self, threshold: float, num_perm: int):
+        self.num_bands, self.rows = _optimal_bands(threshold, num_perm)
+        self.bands: list[dict[int, list[int]]] = [{} for _ in range(self.num_bands)]
+        self._row_salts = _row_salts(self.rows)
+
+    def insert(self, key: int, sig: np.ndarray) -> None:
+        """Add key to the bucket of each band of sig."""
+        for band, band_key in zip(self.bands, self._band_keys(sig)):
+            bucket = band.get(band_key)
+            if bucket is None:
+                band[band_key] = [key]
+            else:
+                bucket.append(key)
+
+    def query(self, sig: np.ndarray) -> list[int]:
+        """Return the keys sharing at least one band bucket with sig."""
+        found: set[int] = set()
+        for band, band_key in zip(self.bands, self._band_keys(sig)):
+            bucket = band.get(band_key)
+            if bucket is not None:
+                found.update(bucket)
+        return list(found)
+
+    def _band_keys(self, sig: np.ndarray) -> list[int]:
+        keys = _band_hashes(sig, self.num_bands, self._row_salts)
+        return (keys >> np.uint64(32)).tolist()
+
+
+class BloomLSH:
+    """Banded LSH that keeps only a Bloom filter of band hashes per band.
+
+    For large dedup batches: memory is a fixed bit array per band, sized
+    for capacity signatures, instead of a dict entry and key list per band
+    per record. It can only answer whether some earlier signature shared a
+    band, and a query falsely reports one with probability of about
+    num_bands * fp_rate.
+    """
+
+    def __init__(self, threshold: float, num_perm: int, capacity: int, fp_rate: float):
+        self.num_bands, self.rows = _optimal_bands(threshold, num_perm)
+        self._row_salts = _row_salts(self.rows)
+        # Standard Bloom filter sizing for capacity items at fp_rate
+        capacity = max(capacity, 1)
+        bits = -capacity * math.log(fp_rate) / math.log(2) ** 2
+        self.num_bits = max(8, math.ceil(bits))
+        num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = np.zeros((self.num_bands, (self.num_bits + 7) // 8), dtype=np.uint8)
+        self._band_rows = np.arange(self.num_bands)[:, None]
+        self._probe_steps = np.arange(num_hashes, dtype=np.uint64)
+
+    def insert(self, key: int, sig: np.ndarray) -> None:
+        """Set the filter bits of each band of sig. key is not stored."""
+        byte, mask = self._probes(sig)
+        np.bitwise_or.at(self.bits, (self._band_rows, byte), mask)
+
+    def query(self, sig: np.ndarray) -> bool:
+        """Return whether any band of sig is (probably) in its filter."""
+        byte, mask = self._probes(sig)
+        present = (self.bits[self._band_rows, byte] & mask) != 0
+        return bool(present.all(axis=1).any())
+
+    def _probes(self, sig: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return the (bands, hashes) byte offsets and bit masks for sig.
+
+        Probes use double hashing on the two halves of each band hash.
+        """
+        keys = _band_hashes(sig, self.num_bands, self._row_salts)
+        step = (keys >> np.uint64(32)) | np.uint64(1)
+        bit = (keys & _LOW_32)[:, None] + self._probe_steps * step[:, None]
+        bit %= np.uint64(self.num_bits)
+        byte = (bit >> np.uint64(3)).astype(np.intp)
+        mask = np.left_shift(1, (bit & np.uint64(7)).astype(np.uint8)).astype(np.uint8)
+        return byte, mask
+
 
 class Deduplicator:
     """Removes duplicate and near-duplicate content from scraped records."""
 
+    __slots__ = (
+        "similarity_threshold",
+        "num_perm",
+        "min_minhash_batch",
+        "large_batch_threshold",
+        "bloom_fp_rate",
+        "_word_hashes",
+    )
+
     def __init__(
         self,
         similarity_threshold: float = 0.7,
         num_perm: int = 128,
+        min_minhash_batch: int = 32,
+        large_batch_threshold: int = 100_000,
+        bloom_fp_rate: float = 1e-4,
     ):
         """Initialize the deduplicator.
 
         Args:
             similarity_threshold: Jaccard similarity threshold for near-duplicates.
                 0.7 means 70% similar content is considered a duplicate.
-            num_perm: Number of permutation functions for MinHash.
+            num_perm: Number of MinHash signature bins.
+            min_minhash_batch: Skip near-duplicate detection when fewer
+                records than this are left after the URL and GitHub levels.
+            large_batch_threshold: Above this many MinHash candidates, use
+                a fixed-size BloomLSH instead of the exact BandedLSH.
+            bloom_fp_rate: Per-band false positive rate of the BloomLSH
+                filters.
         """
         self.similarity_threshold = similarity_threshold
         self.num_perm = num_perm
+        self.min_minhash_batch = min_minhash_batch
+        self.large_batch_threshold = large_batch_threshold
+        self.bloom_fp_rate = bloom_fp_rate
+        # 64-bit hash per distinct word seen by this deduplicator
+        self._word_hashes: dict[str, int] = {}
 
-    def deduplicate(self, records: list[SourceRecord]) -> list[SourceRecord]:
+    def deduplicate(
+        self,
+        records: list[SourceRecord],
+        max_workers: Optional[int] = None,
+    ) -> list[SourceRecord]:
         """Remove duplicates from a list of SourceRecords.
 
         Applies dedup in order:
@@ -45,114 +271,236 @@ class Deduplicator:
         Returns:
             Deduplicated list of SourceRecords.
         """
-        initial_count = len(records)
-
-        # Step 1: Exact URL dedup
-        records = self._url_dedup(records)
-        after_url = len(records)
-
-        # Step 2: GitHub-specific dedup
-        records = self._github_dedup(records)
-        after_github = len(records)
+        return list(self.deduplicate_stream(records, max_workers))
 
-        # Step 3: Near-duplicate text dedup
-        records = self._minhash_dedup(records)
-        after_minhash = len(records)
-
-        logger.info(
-            "Deduplication: %d → %d (URL: -%d, GitHub: -%d, MinHash: -%d)",
-            initial_count,
-            after_minhash,
-            initial_count - after_url,
-            after_url - after_github,
-            after_github - after_minhash,
-        )
-        return records
-
-    def _url_dedup(self, records: list[SourceRecord]) -> list[SourceRecord]:
-        """Remove records with duplicate URLs, keeping the first occurrence."""
+    def deduplicate_stream(
+        self,
+        records: Iterable[SourceRecord],
+        max_workers: Optional[int] = None,
+    ) -> Iterator[SourceRecord]:
+        """Yield records that survive all three dedup levels.
+
+        The URL and GitHub levels run as records arrive; their survivors
+        then go through MinHash one at a time, each signature queried and
+        inserted as soon as it is built (in parallel for large batches), so
+        only the records themselves are held between levels. Every level
+        keeps the first
+        occurrence, so the same records are kept as by three successive
+        passes over the list.
+        """
         seen_urls: set[str] = set()
-        unique = []
-        for record in records:
-            url = record.url.rstrip("/").lower()
-            if url not in seen_urls:
-                seen_urls.add(url)
-                unique.append(record)
-        return unique
-
-    def _github_dedup(self, records: list[SourceRecord]) -> list[SourceRecord]:
-        """Remove duplicate GitHub issues/discussions by number."""
-        github_types = {SourceType.GITHUB_ISSUE, SourceType.GITHUB_DISCUSSION}
-        seen_github: set[str] = set()
-        unique = []
+        seen_github: set[tuple] = set()
+        # A text seen before is always a MinHash duplicate: either of the
+        # record kept with it or of whatever that record duplicated.
+        seen_texts: set[str] = set()
+        candidates: list[SourceRecord] = []
+        initial_count = url_removed = github_removed = text_removed = 0
+        github_key = self._github_key
 
         for record in records:
-            if record.source_type in github_types:
-                metadata = record.metadata
-                if record.source_type == SourceType.GITHUB_ISSUE:
-                    key = f"{record.origin}-issue-{metadata.get('issue_number', '')}"
-                else:
-                    key = f"{record.origin}-discussion-{metadata.get('discussion_number', '')}"
+            initial_count += 1
 
+            # Step 1: Exact URL dedup
+            url = record.normalized_url
+            if url in seen_urls:
+                url_removed += 1
+                continue
+            seen_urls.add(url)
+
+            # Step 2: GitHub-specific dedup
+            key = github_key(record)
+            if key is not None:
                 if key in seen_github:
+                    github_removed += 1
                     continue
                 seen_github.add(key)
 
-            unique.append(record)
-
-        return unique
-
-    def _minhash_dedup(self, records: list[SourceRecord]) -> list[SourceRecord]:
-        """Remove near-duplicate content using MinHash LSH."""
-        if len(records) <= 1:
-            return records
+            if record.text in seen_texts:
+                text_removed += 1
+                continue
+            seen_texts.add(record.text)
+            candidates.append(record)
 
-        lsh = MinHashLSH(threshold=self.similarity_threshold, num_perm=self.num_perm)
-        minhashes: dict[str, MinHash] = {}
+        # Step 3: Near-duplicate text dedup
+        if len(candidates) < self.min_minhash_batch:
+            kept_records = iter(candidates)
+        else:
+            kept_records = self._minhash_dedup(candidates, max_workers)
+        kept_count = 0
+        for record in kept_records:
+            kept_count += 1
+            yield record
 
-        # Build MinHash for each record
-        for record in records:
-            mh = self._text_to_minhash(record.text)
-            minhashes[record.id] = mh
+        logger.info(
+            "Deduplication: %d → %d (URL: -%d, GitHub: -%d, MinHash: -%d)",
+            initial_count,
+            kept_count,
+            url_removed,
+            github_removed,
+            text_removed + len(candidates) - kept_count,
+        )
 
-        # Insert into LSH and find duplicates
-        keep_ids: set[str] = set()
-        duplicate_ids: set[str] = set()
+    def _github_key(self, record: SourceRecord) -> Optional[tuple]:
+        """Return the issue/discussion dedup key, or None for other types.
 
-        for record in records:
-            if record.id in duplicate_ids:
+        A tuple of the existing origin and number objects, so no key string
+        is formatted per record.
+        """
+        metadata = record.metadata
+        if record.source_type == SourceType.GITHUB_ISSUE:
+            return (record.origin, "issue", metadata.get("issue_number", ""))
+        if record.source_type == SourceType.GITHUB_DISCUSSION:
+            return (record.origin, "discussion", metadata.get("discussion_number", ""))
+        return None
+
+    def _minhash_dedup(
+        self,
+        records: list[SourceRecord],
+        max_workers: Optional[int] = None,
+    ) -> Iterator[SourceRecord]:
+        """Yield records that don't near-duplicate an earlier kept record."""
+        signatures = self._signatures([r.text_lower for r in records], max_workers)
+
+        if len(records) > self.large_batch_threshold:
+            lsh = BloomLSH(
+                self.similarity_threshold,
+                self.num_perm,
+                capacity=len(records),
+                fp_rate=self.bloom_fp_rate,
+            )
+        else:
+            lsh = BandedLSH(self.similarity_threshold, self.num_perm)
+        kept_ids: set[str] = set()
+        # Bound once rather than looked up per candidate
+        query, insert, keep_id = lsh.query, lsh.insert, kept_ids.add
+        for record, sig in zip(records, signatures):
+            # Ids stay unique in the output; a repeated id is dropped like a duplicate
+            if record.id in kept_ids:
                 continue
-
-            mh = minhashes[record.id]
-
             # Check if any existing entry is similar
-            try:
-                result = lsh.query(mh)
-                if result:
-                    # This is a near-duplicate of something already kept
-                    duplicate_ids.add(record.id)
-                    continue
-            except ValueError:
-                pass
-
+            if query(sig):
+                continue
             # Keep this record and add to LSH
-            try:
-                lsh.insert(record.id, mh)
-                keep_ids.add(record.id)
-            except ValueError:
-                # Duplicate key — skip
-                pass
-
-        return [r for r in records if r.id in keep_ids]
-
-    def _text_to_minhash(self, text: str) -> MinHash:
-        """Convert text to a MinHash using word-level 3-shingles."""
-        mh = MinHash(num_perm=self.num_perm)
-        words = text.lower().split()
+            insert(len(kept_ids), sig)
+            keep_id(record.id)
+            yield record
+
+    def _signatures(
+        self, texts: list[str], max_workers: Optional[int] = None
+    ) -> Iterator[np.ndarray]:
+        """Yield each lowercased text's signature, from a pool for large batches.
+
+        Pool workers write signatures straight into one shared-memory
+        (texts, num_perm) matrix, so only the texts are pickled; chunks are
+        yielded in order as each one finishes.
+        """
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+
+        if max_workers > 1 and len(texts) >= PARALLEL_MIN_RECORDS:
+            yield from self._shared_signatures(texts, max_workers)
+        else:
+            for text in texts:
+                yield self._signature(text)
+
+    def _shared_signatures(
+        self, texts: list[str], max_workers: int
+    ) -> Iterator[np.ndarray]:
+        shape = (len(texts), self.num_perm)
+        shm = SharedMemory(create=True, size=shape[0] * shape[1] * 8)
+        sigs = np.ndarray(shape, dtype=np.uint64, buffer=shm.buf)
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                starts = range(0, len(texts), SIGNATURE_CHUNK_SIZE)
+                futures = [
+                    executor.submit(
+                        _signature_worker,
+                        shm.name,
+                        start,
+                        texts[start : start + SIGNATURE_CHUNK_SIZE],
+                        self.num_perm,
+                    )
+                    for start in starts
+                ]
+                for start, future in zip(starts, futures):
+                    future.result()
+                    # Copies, so no view outlives the shared block
+                    end = min(start + SIGNATURE_CHUNK_SIZE, len(texts))
+                    for row in range(start, end):
+                        yield sigs[row].copy()
+        finally:
+            del sigs
+            shm.close()
+            shm.unlink()
+
+    def _signature(self, text_lower: str) -> np.ndarray:
+        """Return the num_perm-bin MinHash signature of text's 3-shingles.
+
+        Uses one-permutation hashing: each shingle is hashed once, the low
+        part of the hash picks one of num_perm bins and the rest is its
+        value; each bin keeps its minimum value. Bins no shingle reached are
+        filled by densification, so signatures estimate Jaccard similarity
+        like a num_perm-permutation MinHash at the cost of a single hash.
+        """
+        hashes = self._shingle_hashes(text_lower)
+        sig = np.full(self.num_perm, _EMPTY_BIN, dtype=np.uint64)
+        if len(hashes):
+            num_perm = np.uint64(self.num_perm)
+            bins = (hashes % num_perm).astype(np.intp)
+            np.minimum.at(sig, bins, hashes // num_perm)
+            self._densify(sig)
+        return sig
+
+    def _densify(self, sig: np.ndarray) -> None:
+        """Fill empty bins of sig in place (Shrivastava's optimal densification).
+
+        Each empty bin probes bins in its own fixed pseudo-random order and
+        copies the value of the first one a shingle reached. Probes are
+        taken DENSIFY_PROBES at a time for all empty bins at once, from
+        precomputed probe tables, so even a short text with mostly empty
+        bins needs only a few table lookups.
+        """
+        filled = sig != _EMPTY_BIN
+        pending = np.flatnonzero(~filled)
+        first_attempt = 1
+        while len(pending):
+            probes = _probe_bins(self.num_perm, first_attempt)[pending]
+            hits = filled[probes]
+            found = hits.any(axis=1)
+            first = hits.argmax(axis=1)[found]
+            sig[pending[found]] = sig[probes[found, first]]
+            pending = pending[~found]
+            first_attempt += DENSIFY_PROBES
+
+    def _shingle_hashes(self, text_lower: str) -> np.ndarray:
+        """Return a 64-bit hash for each 3-word shingle of already-lowercased text.
+
+        Each distinct word is hashed once (and cached); the shingle hashes
+        are then combined from the word hashes with vectorized integer
+        mixing, so no shingle string is ever built. Word hashes are read
+        with a plain map over the cache, and only when that misses are the
+        new words hashed and the lookup retried.
+        """
+        words = text_lower.split()
+        if len(words) < 3:
+            return np.empty(0, dtype=np.uint64)
+
+        word_hashes = self._word_hashes
+        try:
+            hashed = np.fromiter(
+                map(word_hashes.__getitem__, words), dtype=np.uint64, count=len(words)
+            )
+        except KeyError:
+            for word in set(words).difference(word_hashes):
+                self._hash_word(word)
+            hashed = np.fromiter(
+                map(word_hashes.__getitem__, words), dtype=np.uint64, count=len(words)
+            )
 
         # Create 3-word shingles
-        for i in range(len(words) - 2):
-            shingle = " ".join(words[i : i + 3])
-            mh.update(shingle.encode("utf-8"))
+        m1, m2, m3 = _SHINGLE_MULTIPLIERS
+        return _mix64((hashed[:-2] * m1) ^ (hashed[1:-1] * m2) ^ (hashed[2:] * m3))
 
-        return mh
+    def _hash_word(self, word: str) -> None:
+        digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+        self._word_hashes[word] = int.from_bytes(digest, "little")
@@ -7,7 +7,7 @@ Filters out:
 """
 
 import logging
-import re
+from typing import Iterable, Iterator
 
 from schemas.source_record import SourceRecord, SourceType
 
@@ -19,10 +19,27 @@ TOPIC_EXEMPT_TYPES = {
     SourceType.GITHUB_RELEASE,
 }
 
+# Common boilerplate indicators; a text containing BOILERPLATE_MIN_PHRASES
+# of them is treated as navigation/boilerplate
+BOILERPLATE_PHRASES = (
+    "skip to content",
+    "table of contents",
+    "cookie policy",
+    "privacy policy",
+    "terms of service",
+    "subscribe to newsletter",
+)
+BOILERPLATE_MIN_PHRASES = 3
+
+# Texts with fewer words than this are checked for being mostly links
+NAVIGATION_MAX_WORDS = 50
+
 
 class QualityFilter:
     """Filters out low-quality or irrelevant scraped content."""
 
+    __slots__ = ("min_word_count", "max_code_ratio", "require_topics")
+
     def __init__(
         self,
         min_word_count: int = 100,
@@ -46,23 +63,30 @@ class QualityFilter:
         Returns:
             Filtered list of SourceRecords.
         """
-        kept = []
+        return list(self.filter_stream(records))
+
+    def filter_stream(self, records: Iterable[SourceRecord]) -> Iterator[SourceRecord]:
+        """Yield the records that pass quality checks, logging once exhausted."""
+        total = 0
+        kept = 0
         removed_reasons: dict[str, int] = {}
+        should_remove = self._should_remove
 
         for record in records:
-            reason = self._should_remove(record)
+            total += 1
+            reason = should_remove(record)
             if reason:
                 removed_reasons[reason] = removed_reasons.get(reason, 0) + 1
                 continue
-            kept.append(record)
+            kept += 1
+            yield record
 
         logger.info(
             "Quality filter: kept %d / %d records. Removed: %s",
-            len(kept),
-            len(records),
+            kept,
+            total,
             removed_reasons,
         )
-        return kept
 
     def _should_remove(self, record: SourceRecord) -> str:
         """Check if a record should be removed.
@@ -78,7 +102,7 @@ class QualityFilter:
         if self.require_topics:
             if (
                 record.source_type not in TOPIC_EXEMPT_TYPES
-                and (not record.topics or record.topics == ["unclassified"])
+                and (not record.topics or record.topics == ("unclassified",))
             ):
                 return "no_topics"
 
@@ -89,48 +113,58 @@ class QualityFilter:
                 return "mostly_code"
 
         # Check for boilerplate/navigation-only content
-        if self._is_boilerplate(record.text):
+        if self._is_boilerplate(record):
             return "boilerplate"
 
         return ""
 
     def _code_ratio(self, text: str) -> float:
-        """Calculate the ratio of code block content to total content."""
-        code_blocks = re.findall(r"```[\s\S]*?```", text)
-        if not code_blocks:
-            return 0.0
+        """Calculate the ratio of code block content to total content.
 
-        code_chars = sum(len(block) for block in code_blocks)
+        A block runs from a ``` fence to the next one (what a non-greedy
+        regex would match). Fences are located with str.find, so only
+        block lengths are computed, never the block strings.
+        """
         total_chars = len(text)
         if total_chars == 0:
             return 0.0
 
+        code_chars = 0
+        start = text.find("```")
+        while start != -1:
+            end = text.find("```", start + 3)
+            if end == -1:
+                break
+            end += 3
+            code_chars += end - start
+            start = text.find("```", end)
+
         return code_chars / total_chars
 
-    def _is_boilerplate(self, text: str) -> bool:
+    def _is_boilerplate(self, record: SourceRecord) -> bool:
         """Detect if text is mostly navigation/boilerplate."""
-        # Common boilerplate indicators
-        boilerplate_phrases = [
-            "skip to content",
-            "table of contents",
-            "cookie policy",
-            "privacy policy",
-            "terms of service",
-            "subscribe to newsletter",
-        ]
-
-        text_lower = text.lower()
-        boilerplate_count = sum(
-            1 for phrase in boilerplate_phrases if phrase in text_lower
-        )
-
-        # If more than half the text matches boilerplate patterns
-        if boilerplate_count >= 3:
-            return True
-
-        # Very short text that's mostly links/navigation
-        words = text.split()
-        if len(words) < 50:
+        text = record.text
+        text_lower = record.text_lower
+
+        # If more than half the text matches boilerplate patterns. Each
+        # phrase is a separate C substring search; stop as soon as the
+        # outcome is known instead of always running all of them.
+        needed = BOILERPLATE_MIN_PHRASES
+        unchecked = len(BOILERPLATE_PHRASES)
+        for phrase in BOILERPLATE_PHRASES:
+            if phrase in text_lower:
+                needed -= 1
+                if needed == 0:
+                    return True
+            unchecked -= 1
+            if unchecked < needed:
+                break
+
+        # Very short text that's mostly links/navigation. Splitting stops
+        # after NAVIGATION_MAX_WORDS words, so a long text is never split
+        # in full only to find it isn't short.
+        words = text.split(None, NAVIGATION_MAX_WORDS)
+        if len(words) < NAVIGATION_MAX_WORDS:
             link_words = sum(1 for w in words if w.startswith("http") or w.startswith("/"))
             if link_words > len(words) * 0.3:
                 return True
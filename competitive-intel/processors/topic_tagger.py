@@ -5,26 +5,115 @@ the top matching topics. Uses both global keywords (from keywords.json)
 and competitor-specific keywords (from the competitor config).
 """
 
-import json
+import hashlib
 import logging
+import os
 import re
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+import orjson
 
 from schemas.source_record import SourceRecord
 
+try:
+    # Optional: Hyperscan matches every keyword in one SIMD pass over the
+    # text, with the same Unicode case folding as re.IGNORECASE.
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    # Optional: one Aho-Corasick pass over the text finds every keyword,
+    # instead of one regex scan of the text per keyword.
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+# Records scored together by tag_stream: each keyword is matched once over
+# the batch's joined texts instead of once per record
+TAG_BATCH_SIZE = 256
+
+# Joins texts for batch matching; a non-word char, so it acts as a word
+# boundary like the start/end of a text, and no keyword contains it
+_TEXT_SEPARATOR = "\0"
+
+# Lowercase chars re.IGNORECASE treats as equal though str.lower() keeps them
+# apart (re._casefix), each mapped to one member of its group. Applied
+# to keywords and text for the automaton, so it matches like the regexes.
+_CASE_FOLDS = str.maketrans(
+    "\u0131\u017f\u03b9\u03bc\u03c3\u03d0\u03d1\u03d5\u03d6\u03f0\u03f1\u03f5"
+    "\u1c80\u1c81\u1c82\u1c83\u1c84\u1c85\u1c86\u1c87"
+    "\u1e9b\u1fbe\u1fd3\u1fe3\ua64b\ufb06",
+    "is\u0345\xb5\u03c2\u03b2\u03b8\u03c6\u03c0\u03ba\u03c1\u03b5"
+    "\u0432\u0434\u043e\u0441\u0442\u0442\u044a\u0463"
+    "\u1e61\u0345\u0390\u03b0\u1c88\ufb05",
+)
+
+
+def _is_word_char(ch: str) -> bool:
+    """Whether ch is a word character in the sense of ``re``'s str patterns."""
+    return ch.isalnum() or ch == "_"
+
+
+def _char_before(data: bytes, pos: int) -> str:
+    """Return the UTF-8 character ending at byte pos, or "" at the start."""
+    if pos == 0:
+        return ""
+    begin = pos - 1
+    while begin > 0 and data[begin] & 0xC0 == 0x80:
+        begin -= 1
+    return data[begin:pos].decode()
+
+
+def _char_after(data: bytes, pos: int) -> str:
+    """Return the UTF-8 character starting at byte pos, or "" at the end."""
+    if pos >= len(data):
+        return ""
+    end = pos + 1
+    while end < len(data) and data[end] & 0xC0 == 0x80:
+        end += 1
+    return data[pos:end].decode()
+
+
+def _text_starts(lengths: list[int]) -> np.ndarray:
+    """Offsets of each text in the texts joined by a one-unit separator."""
+    starts = np.zeros(len(lengths), dtype=np.int64)
+    np.cumsum(np.asarray(lengths[:-1], dtype=np.int64) + 1, out=starts[1:])
+    return starts
+
 
 class TopicTagger:
     """Tags SourceRecords with taxonomy topic IDs based on keyword matching."""
 
+    __slots__ = (
+        "max_topics",
+        "min_score_threshold",
+        "database_cache_dir",
+        "topic_keywords",
+        "_topics_by_text",
+        "_compiled_patterns",
+        "_all_patterns",
+        "_scored_topics",
+        "_topic_sizes",
+        "_pattern_weights",
+        "_pattern_topics",
+        "_targets",
+        "_database",
+        "_automaton",
+    )
+
     def __init__(
         self,
         global_keywords_path: str = "config/keywords.json",
         competitor_keywords: Optional[dict[str, list[str]]] = None,
         max_topics: int = 3,
         min_score_threshold: float = 0.01,
+        database_cache_dir: Optional[str] = None,
     ):
         """Initialize the tagger.
 
@@ -33,17 +122,24 @@ class TopicTagger:
             competitor_keywords: Optional competitor-specific keyword overrides.
             max_topics: Maximum number of topics to assign per record.
             min_score_threshold: Minimum score to qualify as a match.
+            database_cache_dir: Directory to keep compiled Hyperscan
+                databases in, keyed by their keywords, so later runs load
+                them instead of recompiling. None disables the cache.
         """
         self.max_topics = max_topics
         self.min_score_threshold = min_score_threshold
+        self.database_cache_dir = database_cache_dir
+
+        # Topics already computed for a (title, text); mirrored and paginated
+        # copies of a page are scored once. str caches its own hash.
+        self._topics_by_text: dict[tuple[str, str], tuple[str, ...]] = {}
 
         # Load global keywords
         self.topic_keywords: dict[str, list[str]] = {}
         kw_path = Path(global_keywords_path)
         if kw_path.exists():
-            with open(kw_path) as f:
-                data = json.load(f)
-                self.topic_keywords = data.get("topic_keywords", {})
+            data = orjson.loads(kw_path.read_bytes())
+            self.topic_keywords = data.get("topic_keywords", {})
 
         # Merge competitor-specific keywords (they supplement, not replace)
         if competitor_keywords:
@@ -60,6 +156,9 @@ class TopicTagger:
 
         # Precompile patterns for efficiency
         self._compiled_patterns: dict[str, list[tuple[re.Pattern, float]]] = {}
+        # Every pattern in topic order; a pattern's position here is its
+        # pattern id in the matchers
+        self._all_patterns: list[tuple[str, re.Pattern, float]] = []
         for topic_id, keywords in self.topic_keywords.items():
             patterns = []
             for kw in keywords:
@@ -68,75 +167,372 @@ class TopicTagger:
                 try:
                     pattern = re.compile(r"\b" + re.escape(kw) + r"\b", re.IGNORECASE)
                     patterns.append((pattern, weight))
+                    self._all_patterns.append((kw, pattern, weight))
                 except re.error:
                     logger.warning("Invalid keyword pattern: %s", kw)
             self._compiled_patterns[topic_id] = patterns
 
+        # Topics that can score, in the order score ties are broken
+        self._scored_topics = [t for t, p in self._compiled_patterns.items() if p]
+        self._topic_sizes = np.array(
+            [len(self._compiled_patterns[t]) for t in self._scored_topics], dtype=float
+        )
+        # Weight and scored-topic index of each pattern, by pattern id.
+        # Weights are multiples of 0.5, so hits scattered into the topic
+        # totals sum exactly in any order, the same as a running sum.
+        self._pattern_weights = np.array(
+            [weight for _kw, _pattern, weight in self._all_patterns], dtype=float
+        )
+        self._pattern_topics = np.repeat(
+            np.arange(len(self._scored_topics)), self._topic_sizes.astype(int)
+        )
+
+        # Pattern targets for the matchers: (pattern column, first char is
+        # a word char, last char is a word char). An empty keyword can't be
+        # matched as a literal; with one, only the regexes are used.
+        self._targets = [
+            (column, _is_word_char(kw[0]), _is_word_char(kw[-1]))
+            for column, (kw, _pattern, _weight) in enumerate(self._all_patterns)
+            if kw
+        ]
+
+        self._database = self._build_database() if hyperscan is not None else None
+        self._automaton = None
+        if self._database is None and ahocorasick is not None:
+            self._automaton = self._build_automaton()
+
+    def _build_database(self):
+        """Compile all keywords into one caseless Hyperscan block database.
+
+        Keywords are compiled as plain literals, since Hyperscan's word
+        boundaries are ASCII only; they are checked per hit instead. Pattern
+        ids index self._targets. With database_cache_dir set, a database
+        saved for the same keywords is loaded instead of compiled.
+        """
+        if not self._targets or len(self._targets) != len(self._all_patterns):
+            return None
+        expressions = [re.escape(kw).encode() for kw, _p, _w in self._all_patterns]
+
+        flags = (
+            hyperscan.HS_FLAG_CASELESS
+            | hyperscan.HS_FLAG_UTF8
+            | hyperscan.HS_FLAG_SOM_LEFTMOST
+        )
+        cache_path = None
+        if self.database_cache_dir is not None:
+            digest = hashlib.sha256(b"\n".join([str(flags).encode(), *expressions]))
+            cache_path = Path(self.database_cache_dir) / (
+                f"keywords-{digest.hexdigest()[:16]}.hsdb"
+            )
+            try:
+                database = hyperscan.loadb(
+                    cache_path.read_bytes(), hyperscan.HS_MODE_BLOCK
+                )
+                # Unlike compile(), loading doesn't allocate scan scratch space
+                database.scratch = hyperscan.Scratch(database)
+                return database
+            except (OSError, hyperscan.error):
+                pass  # Not cached yet, or saved by another Hyperscan build
+
+        database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        try:
+            database.compile(
+                expressions=expressions,
+                ids=list(range(len(expressions))),
+                elements=len(expressions),
+                flags=[flags] * len(expressions),
+            )
+        except hyperscan.error as e:
+            logger.warning("Hyperscan compile failed, not using it: %s", e)
+            return None
+        if cache_path is not None:
+            self._save_database(database, cache_path)
+        return database
+
+    @staticmethod
+    def _save_database(database, cache_path: Path) -> None:
+        """Write a compiled database to cache_path; failures only log."""
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(hyperscan.dumpb(database))
+            # Renamed into place, so a concurrent reader never sees half a file
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning("Could not cache Hyperscan database: %s", e)
+
+    def _build_automaton(self):
+        """Build an Aho-Corasick automaton over all case-folded keywords.
+
+        Each keyword maps to the targets of the patterns it stands for, so
+        the word boundaries of every hit can be checked.
+        """
+        if not self._targets or len(self._targets) != len(self._all_patterns):
+            return None
+        entries: dict[str, list[tuple[int, bool, bool]]] = {}
+        for target in self._targets:
+            kw = self._all_patterns[target[0]][0]
+            entries.setdefault(kw.lower().translate(_CASE_FOLDS), []).append(target)
+
+        automaton = ahocorasick.Automaton()
+        for key, targets in entries.items():
+            automaton.add_word(key, (len(key), targets))
+        automaton.make_automaton()
+        return automaton
+
     def tag(self, record: SourceRecord) -> SourceRecord:
         """Tag a single SourceRecord with matching topics.
 
         Modifies record.topics in place and returns the record.
         """
-        text = f"{record.title} {record.text}"
-        scores = self._score_topics(text)
-
-        # Sort by score descending, take top N above threshold
-        sorted_topics = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-        top_topics = [
-            topic_id
-            for topic_id, score in sorted_topics[:self.max_topics]
-            if score >= self.min_score_threshold
-        ]
-
-        if not top_topics:
-            record.topics = ["unclassified"]
-        else:
-            record.topics = top_topics
-
+        self._tag_batch([record])
         return record
 
     def tag_batch(self, records: list[SourceRecord]) -> list[SourceRecord]:
         """Tag a batch of SourceRecords."""
-        tagged = []
-        for record in records:
-            tagged.append(self.tag(record))
+        return list(self.tag_stream(records))
 
-        # Log statistics
+    def tag_stream(self, records: Iterable[SourceRecord]) -> Iterator[SourceRecord]:
+        """Tag records TAG_BATCH_SIZE at a time, logging statistics once exhausted."""
+        tagged = 0
         topic_counts: dict[str, int] = {}
         unclassified = 0
-        for r in tagged:
-            if r.topics == ["unclassified"]:
-                unclassified += 1
-            for t in r.topics:
-                topic_counts[t] = topic_counts.get(t, 0) + 1
+        records = iter(records)
+        while batch := list(islice(records, TAG_BATCH_SIZE)):
+            self._tag_batch(batch)
+            for r in batch:
+                tagged += 1
+                if r.topics == ("unclassified",):
+                    unclassified += 1
+                for t in r.topics:
+                    topic_counts[t] = topic_counts.get(t, 0) + 1
+                yield r
 
+        # Log statistics
         logger.info(
             "Tagged %d records: %d unclassified, topic distribution: %s",
-            len(tagged),
+            tagged,
             unclassified,
             dict(sorted(topic_counts.items(), key=lambda x: x[1], reverse=True)[:10]),
         )
-        return tagged
 
-    def _score_topics(self, text: str) -> dict[str, float]:
-        """Score all topics for a given text.
+    def _tag_batch(self, records: list[SourceRecord]) -> None:
+        """Set topics on records, scoring each distinct (title, text) once."""
+        # Topics already computed for a (title, text) are reused; new
+        # distinct ones are scored together
+        cache = self._topics_by_text
+        new_keys: dict[tuple[str, str], SourceRecord] = {}
+        for record in records:
+            key = (record.title, record.text)
+            if key not in cache:
+                new_keys.setdefault(key, record)
+        if new_keys:
+            texts = [f"{title} {text}" for title, text in new_keys]
+            lowered = None
+            if self._database is None and self._automaton is not None:
+                # The automaton matches lowercased text; reuse the records'
+                # cached text_lower rather than lowercasing every text again
+                lowered = [
+                    f"{r.title.lower()} {r.text_lower}" for r in new_keys.values()
+                ]
+            for key, top_topics in zip(new_keys, self._top_topics(texts, lowered)):
+                cache[key] = tuple(top_topics)
+
+        for record in records:
+            record.topics = cache[(record.title, record.text)]
+
+    def _top_topics(
+        self, texts: list[str], lowered: Optional[list[str]] = None
+    ) -> list[list[str]]:
+        """Return the top topic IDs for each text, or ["unclassified"]."""
+        scores = self._score_topics(texts, lowered)
+
+        # Sort by score descending (stable, so ties keep topic order), take
+        # top N above threshold
+        order = np.argsort(-scores, axis=1, kind="stable")[:, : self.max_topics]
+        # Plain lists and locals: the loop runs per text and per kept column
+        scored_topics = self._scored_topics
+        threshold = self.min_score_threshold
+        results = []
+        for row, columns in zip(scores.tolist(), order.tolist()):
+            top_topics = [scored_topics[j] for j in columns if row[j] >= threshold]
+            results.append(top_topics or ["unclassified"])
+        return results
+
+    def _score_topics(
+        self, texts: list[str], lowered: Optional[list[str]] = None
+    ) -> np.ndarray:
+        """Score all topics for each text, as a (texts, topics) matrix.
 
         Score = sum of (keyword_match_count * keyword_weight) / total_keywords_for_topic.
+        Topics without a match get -inf. Columns follow self._scored_topics.
         """
-        scores = {}
-        text_len = len(text.split())
+        total_score = self._keyword_totals(texts, lowered)
 
-        for topic_id, patterns in self._compiled_patterns.items():
-            if not patterns:
-                continue
+        # Normalize by number of keywords
+        scores = np.full(total_score.shape, -np.inf)
+        matched = total_score > 0
+        scores[matched] = (total_score / self._topic_sizes)[matched]
+        return scores
 
-            total_score = 0.0
-            for pattern, weight in patterns:
-                matches = len(pattern.findall(text))
-                total_score += matches * weight
+    def _keyword_totals(
+        self, texts: list[str], lowered: Optional[list[str]] = None
+    ) -> np.ndarray:
+        """Sum the weights of each topic's keyword matches in each text.
 
-            # Normalize by number of keywords and text length
-            if total_score > 0:
-                scores[topic_id] = total_score / len(patterns)
+        Returns a (texts, topics) matrix where each pattern contributes
+        len(pattern.findall(text)) * its weight. Texts are joined and
+        matched in one pass by Hyperscan or the Aho-Corasick automaton when
+        available; texts those can't match exactly, or all of them without
+        either, go through the regexes, still one finditer per pattern over
+        the joined texts. lowered, if given, holds texts already lowercased
+        for the automaton.
+        """
+        totals = np.zeros((len(texts), len(self._scored_topics)))
+        rows = list(range(len(texts)))
+        if self._database is not None:
+            rows = self._scan_keyword_matches(texts, rows, totals)
+        elif self._automaton is not None:
+            rows = self._count_keyword_matches(texts, rows, totals, lowered)
+        if rows:
+            self._regex_keyword_matches(texts, rows, totals)
+        return totals
 
-        return scores
+    def _add_hits(
+        self, totals: np.ndarray, hit_rows: np.ndarray, hit_columns: list[int]
+    ) -> None:
+        """Scatter-add each hit's pattern weight into its (row, topic) total."""
+        columns = np.asarray(hit_columns)
+        np.add.at(
+            totals,
+            (hit_rows, self._pattern_topics[columns]),
+            self._pattern_weights[columns],
+        )
+
+    def _regex_keyword_matches(
+        self, texts: list[str], rows: list[int], totals: np.ndarray
+    ) -> None:
+        """Add the weighted regex matches of texts[rows] to totals."""
+        parts = [texts[i] for i in rows]
+        joined = _TEXT_SEPARATOR.join(parts)
+        starts = _text_starts([len(part) for part in parts])
+        row_ids = np.asarray(rows)
+
+        for column, (_kw, pattern, _weight) in enumerate(self._all_patterns):
+            offsets = [m.start() for m in pattern.finditer(joined)]
+            if offsets:
+                hit_rows = row_ids[np.searchsorted(starts, offsets, side="right") - 1]
+                topic = self._pattern_topics[column]
+                np.add.at(totals[:, topic], hit_rows, self._pattern_weights[column])
+
+    def _scan_keyword_matches(
+        self, texts: list[str], rows: list[int], totals: np.ndarray
+    ) -> list[int]:
+        """Add the weighted matches of texts[rows] to totals with one Hyperscan scan.
+
+        Hits must sit on word boundaries, and a pattern's hits that overlap
+        its previous match are dropped, so counts equal findall's. Returns
+        the rows that can't be encoded as UTF-8 (lone surrogates).
+        """
+        encoded = []
+        scanned = []
+        skipped = []
+        for i in rows:
+            try:
+                encoded.append(texts[i].encode("utf-8"))
+                scanned.append(i)
+            except UnicodeEncodeError:
+                skipped.append(i)
+        if not scanned:
+            return skipped
+
+        data = _TEXT_SEPARATOR.encode().join(encoded)
+        targets = self._targets
+        hit_starts: list[int] = []
+        hit_columns: list[int] = []
+        match_ends: dict[int, int] = {}
+        # The callback runs per hit; bind its method lookups once
+        match_end = match_ends.get
+        add_start, add_column = hit_starts.append, hit_columns.append
+
+        def on_match(pattern_id, start, end, flags, context):
+            column, starts_word, ends_word = targets[pattern_id]
+            if (
+                _is_word_char(_char_before(data, start)) == starts_word
+                or _is_word_char(_char_after(data, end)) == ends_word
+            ):
+                return  # Not on a word boundary
+            if start < match_end(column, 0):
+                return  # Overlaps this pattern's previous match
+            match_ends[column] = end
+            add_start(start)
+            add_column(column)
+
+        self._database.scan(data, match_event_handler=on_match)
+        if hit_starts:
+            starts = _text_starts([len(b) for b in encoded])
+            hit_rows = np.asarray(scanned)[
+                np.searchsorted(starts, hit_starts, side="right") - 1
+            ]
+            self._add_hits(totals, hit_rows, hit_columns)
+        return skipped
+
+    def _count_keyword_matches(
+        self,
+        texts: list[str],
+        rows: list[int],
+        totals: np.ndarray,
+        lowered_texts: Optional[list[str]] = None,
+    ) -> list[int]:
+        """Add the weighted matches of texts[rows] to totals in one automaton pass.
+
+        Same hit rules as _scan_keyword_matches. Returns the rows whose
+        length changes when lowercased (e.g. "İ"), where only the regexes
+        match exactly.
+        """
+        lowered = []
+        scanned = []
+        skipped = []
+        for i in rows:
+            if lowered_texts is not None:
+                text_lower = lowered_texts[i]
+            else:
+                text_lower = texts[i].lower()
+            if len(text_lower) == len(texts[i]):
+                lowered.append(text_lower)
+                scanned.append(i)
+            else:
+                skipped.append(i)
+        if not scanned:
+            return skipped
+
+        joined = _TEXT_SEPARATOR.join(lowered)
+        # Only non-ASCII chars are folded; boundaries are checked on joined
+        folded = joined if joined.isascii() else joined.translate(_CASE_FOLDS)
+        last = len(joined) - 1
+        hit_starts: list[int] = []
+        hit_columns: list[int] = []
+        match_ends: dict[int, int] = {}
+        match_end = match_ends.get
+        add_start, add_column = hit_starts.append, hit_columns.append
+
+        for end, (length, targets) in self._automaton.iter(folded):
+            start = end - length + 1
+            word_before = start > 0 and _is_word_char(joined[start - 1])
+            word_after = end < last and _is_word_char(joined[end + 1])
+            for column, starts_word, ends_word in targets:
+                if word_before == starts_word or word_after == ends_word:
+                    continue  # Not on a word boundary
+                if start <= match_end(column, -1):
+                    continue  # Overlaps this pattern's previous match
+                match_ends[column] = end
+                add_start(start)
+                add_column(column)
+
+        if hit_starts:
+            starts = _text_starts([len(t) for t in lowered])
+            hit_rows = np.asarray(scanned)[
+                np.searchsorted(starts, hit_starts, side="right") - 1
+            ]
+            self._add_hits(totals, hit_rows, hit_columns)
+        return skipped
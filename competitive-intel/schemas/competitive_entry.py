@@ -1,7 +1,7 @@
 """Pydantic models for LLM-generated competitive intelligence entries."""
 
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import ClassVar, List, Optional
 from datetime import date
 
 
@@ -77,6 +77,45 @@ class CompetitiveEntry(BaseModel):
         default=0, description="Number of source documents used"
     )
 
+    # Bump when a field change would make previously saved files invalid
+    SCHEMA_VERSION: ClassVar[str] = "1"
+
+    @classmethod
+    def from_saved(cls, data: dict) -> "CompetitiveEntry":
+        """Rebuild an entry from a saved ``model_dump(mode="json")`` dict.
+
+        Files stamped with the current ``_schema_version`` were validated
+        before they were written, so the model tree is rebuilt with
+        ``model_construct`` instead of being validated again. Unstamped or
+        older files go through normal validation.
+        """
+        data = dict(data)
+        if data.pop("_schema_version", None) != cls.SCHEMA_VERSION:
+            return cls(**data)
+
+        def cited(model, item: dict):
+            item = dict(item)
+            item["citations"] = [
+                SourceCitation.model_construct(**c) for c in item.get("citations", [])
+            ]
+            return model.model_construct(**item)
+
+        data["generated_date"] = date.fromisoformat(data["generated_date"])
+        data["competitor_assessment"] = cited(
+            CompetitorAssessment, data["competitor_assessment"]
+        )
+        data["competitor_limitations"] = [
+            cited(CompetitorLimitation, x) for x in data.get("competitor_limitations", [])
+        ]
+        data["kx_differentiators"] = [
+            cited(KXDifferentiator, x) for x in data.get("kx_differentiators", [])
+        ]
+        data["objection_handlers"] = [
+            cited(ObjectionHandler, x) for x in data.get("objection_handlers", [])
+        ]
+        data["elevator_pitch"] = ElevatorPitch.model_construct(**data["elevator_pitch"])
+        return cls.model_construct(**data)
+
 
 class ComparisonRow(BaseModel):
     capability: str
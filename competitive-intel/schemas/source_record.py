@@ -1,7 +1,7 @@
 """Pydantic models for scraped source records."""
 
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import Optional, List, Tuple
 from datetime import date
 from enum import Enum
 
@@ -45,10 +45,12 @@ class SourceRecord(BaseModel):
     content_date: Optional[date] = Field(
         None, description="Publication/update date if known"
     )
-    topics: List[str] = Field(
-        default_factory=list, description="Matched taxonomy topic IDs"
+    # Tuples, so records without tags share the empty tuple and tagged
+    # records can share the tagger's cached result; reassign, don't mutate
+    topics: Tuple[str, ...] = Field(
+        default=(), description="Matched taxonomy topic IDs"
     )
-    subtopics: List[str] = Field(default_factory=list)
+    subtopics: Tuple[str, ...] = ()
     credibility: Credibility = Credibility.OFFICIAL
     sentiment: Sentiment = Sentiment.NEUTRAL
     word_count: int = 0
@@ -56,6 +58,29 @@ class SourceRecord(BaseModel):
         default_factory=dict, description="Source-specific metadata"
     )
 
+    # Derived strings, cached together with the value they came from so a
+    # reassigned url/text (e.g. by ContentExtractor.clean) is never stale
+    _normalized_url: Optional[tuple[str, str]] = PrivateAttr(default=None)
+    _text_lower: Optional[tuple[str, str]] = PrivateAttr(default=None)
+
+    @property
+    def normalized_url(self) -> str:
+        """URL without trailing slashes, lowercased; the dedup key."""
+        cached = self._normalized_url
+        if cached is None or cached[0] is not self.url:
+            # lower() first: rstrip returns that same string when there is
+            # no trailing slash, so usually only one string is allocated
+            cached = self._normalized_url = (self.url, self.url.lower().rstrip("/"))
+        return cached[1]
+
+    @property
+    def text_lower(self) -> str:
+        """Lowercased text, shared by the quality filter and deduplicator."""
+        cached = self._text_lower
+        if cached is None or cached[0] is not self.text:
+            cached = self._text_lower = (self.text, self.text.lower())
+        return cached[1]
+
 
 class GitHubIssueMetadata(BaseModel):
     issue_number: int
@@ -1,5 +1,26 @@
-from scrapers.docs_scraper import DocsScraper
-from scrapers.github_scraper import GitHubScraper
-from scrapers.blog_scraper import BlogScraper
-from scrapers.community_scraper import CommunityScraper
-from scrapers.benchmark_scraper import BenchmarkScraper
+"""Scrapers for each source type.
+
+The scraper classes are re-exported lazily so that importing a light
+submodule such as scrapers.utils doesn't load every scraper.
+"""
+
+_EXPORTS = {
+    "DocsScraper": "scrapers.docs_scraper",
+    "GitHubScraper": "scrapers.github_scraper",
+    "BlogScraper": "scrapers.blog_scraper",
+    "CommunityScraper": "scrapers.community_scraper",
+    "BenchmarkScraper": "scrapers.benchmark_scraper",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -17,12 +17,52 @@ from scrapers.utils import (
     extract_links,
     fetch_url,
     generate_record_id,
+    map_queue,
     normalize_url,
+    parse_html,
     save_records,
 )
 
 logger = logging.getLogger(__name__)
 
+# Known database names, in the order they are reported
+BENCHMARK_DATABASES = (
+    "QuestDB", "ClickHouse", "KDB+", "KDB-X", "TimescaleDB",
+    "InfluxDB", "DuckDB", "PostgreSQL", "MySQL", "MongoDB",
+    "Druid", "Pinot", "CrateDB", "TDengine",
+)
+# Names searched for as lowercase substrings of ASCII text, which is the
+# same as a case-insensitive regex search there
+_DATABASE_KEYS = tuple(db.lower() for db in BENCHMARK_DATABASES)
+# Other text keeps regexes: re.IGNORECASE also folds chars like the Kelvin
+# sign into "k", which str.lower() does not
+_DATABASE_PATTERNS = tuple(
+    re.compile(re.escape(db), re.IGNORECASE) for db in BENCHMARK_DATABASES
+)
+
+# Performance numbers. The unit families share one number prefix and can't
+# overlap, so a single scan finds every hit; the named group that matched
+# says which family it belongs to. Hits are reported family by family.
+_PERF_FAMILIES = ("rows", "latency", "throughput", "qps", "speedup")
+_PERF_PATTERN = re.compile(
+    r"([\d,.]+)(?:\s*(?:"
+    r"(?P<rows>rows?/s(?:ec(?:ond)?)?|rows per second)"
+    r"|(?P<latency>ms|millisecond|microsecond|μs|us|ns|nanosecond)"
+    r"|(?P<throughput>GB/s|MB/s|TB/s)"
+    r"|(?P<qps>QPS|queries per second))"
+    r"|x\s*(?P<speedup>faster|slower))",
+    re.IGNORECASE,
+)
+
+# Hardware specs: core counts and sizes in one scan, as above, then cloud
+# instance types
+_HW_SIZE_PATTERN = re.compile(
+    r"(\d+)\s*(?:(?P<cores>CPU|core|vCPU)"
+    r"|(?P<size>GB|TB)\s*(?P<medium>RAM|memory|disk|SSD|NVMe|storage))",
+    re.IGNORECASE,
+)
+_HW_CLOUD_PATTERN = re.compile(r"(AWS|GCP|Azure)\s+(\w+\.\w+)", re.IGNORECASE)
+
 
 class BenchmarkScraper:
     """Scrapes benchmark and performance comparison pages."""
@@ -118,14 +158,22 @@ class BenchmarkScraper:
         queue.append((start, 0))
         visited.add(start)
 
-        while queue and len(records) < max_pages:
-            url, depth = queue.popleft()
+        # Each batch of the queue is fetched concurrently; pages are still
+        # processed one at a time, in BFS order
+        def fetch(item: tuple[str, int]):
+            return fetch_url(item[0], rate_limiter=rate_limiter)
 
-            response = fetch_url(url, rate_limiter=rate_limiter)
+        for (url, depth), response in map_queue(queue, fetch):
+            if len(records) >= max_pages:
+                break
             if not response:
                 continue
 
-            title, text = extract_content(response.text, "article", url)
+            # Links come from the same parse as the content, taken first
+            # since extract_content strips navigation from the soup
+            soup = parse_html(response.text)
+            links = extract_links(soup, url) if depth < max_depth else []
+            title, text = extract_content(soup, "article", url)
             if not text.strip():
                 title, text = extract_content(response.text, "main", url)
 
@@ -148,13 +196,11 @@ class BenchmarkScraper:
                 )
                 records.append(record)
 
-            if depth < max_depth:
-                links = extract_links(response.text, url)
-                for link in links:
-                    norm = normalize_url(link)
-                    if norm not in visited:
-                        visited.add(norm)
-                        queue.append((norm, depth + 1))
+            for link in links:
+                norm = normalize_url(link)
+                if norm not in visited:
+                    visited.add(norm)
+                    queue.append((norm, depth + 1))
 
         return records
 
@@ -173,38 +219,38 @@ class BenchmarkScraper:
         }
 
         # Known database names
-        db_names = [
-            "QuestDB", "ClickHouse", "KDB\\+", "KDB-X", "TimescaleDB",
-            "InfluxDB", "DuckDB", "PostgreSQL", "MySQL", "MongoDB",
-            "Druid", "Pinot", "CrateDB", "TDengine",
-        ]
-        for db in db_names:
-            if re.search(db, text, re.IGNORECASE):
-                data["databases_mentioned"].append(db.replace("\\+", "+"))
+        if text.isascii():
+            text_lower = text.lower()
+            data["databases_mentioned"] = [
+                db
+                for db, key in zip(BENCHMARK_DATABASES, _DATABASE_KEYS)
+                if key in text_lower
+            ]
+        else:
+            data["databases_mentioned"] = [
+                db
+                for db, pattern in zip(BENCHMARK_DATABASES, _DATABASE_PATTERNS)
+                if pattern.search(text)
+            ]
 
         # Performance numbers
-        perf_patterns = [
-            r"([\d,.]+)\s*(rows?/s(?:ec(?:ond)?)?|rows per second)",
-            r"([\d,.]+)\s*(ms|millisecond|microsecond|μs|us|ns|nanosecond)",
-            r"([\d,.]+)\s*(GB/s|MB/s|TB/s)",
-            r"([\d,.]+)\s*(QPS|queries per second)",
-            r"([\d,.]+)x\s*(faster|slower)",
-        ]
-        for pattern in perf_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                data["performance_numbers"].append(" ".join(match))
+        perf: dict[str, list[str]] = {family: [] for family in _PERF_FAMILIES}
+        for match in _PERF_PATTERN.finditer(text):
+            family = match.lastgroup
+            perf[family].append(f"{match[1]} {match[family]}")
+        for family in _PERF_FAMILIES:
+            data["performance_numbers"].extend(perf[family])
 
         # Hardware specs
-        hw_patterns = [
-            r"(\d+)\s*(CPU|core|vCPU)",
-            r"(\d+)\s*(GB|TB)\s*(RAM|memory|disk|SSD|NVMe|storage)",
-            r"(AWS|GCP|Azure)\s+(\w+\.\w+)",
+        cores, sizes = [], []
+        for match in _HW_SIZE_PATTERN.finditer(text):
+            if match["cores"]:
+                cores.append(f"{match[1]} {match['cores']}")
+            else:
+                sizes.append(f"{match[1]} {match['size']} {match['medium']}")
+        data["hardware_specs"] = cores + sizes + [
+            " ".join(match) for match in _HW_CLOUD_PATTERN.findall(text)
         ]
-        for pattern in hw_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                data["hardware_specs"].append(" ".join(match))
 
         return data
 
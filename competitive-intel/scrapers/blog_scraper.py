@@ -20,6 +20,7 @@ from scrapers.utils import (
     fetch_url,
     generate_record_id,
     is_same_domain,
+    map_queue,
     normalize_url,
     save_records,
 )
@@ -50,6 +51,8 @@ class BlogScraper:
         max_pages = blog_config.get("max_pages", 50)
         rate_limit = blog_config.get("rate_limit_seconds", 0.5)
         priority_keywords = blog_config.get("priority_keywords", [])
+        # Lowered once per run rather than once per post
+        keywords_lower = [kw.lower() for kw in priority_keywords]
 
         pagination_pattern = blog_config.get("pagination_pattern", "")
 
@@ -62,10 +65,14 @@ class BlogScraper:
         )
         logger.info("Discovered %d blog post URLs from %s", len(post_urls), base_url)
 
-        # Scrape each post
+        # Scrape posts concurrently, keeping discovery order for the cutoff
+        def scrape_post(url: str) -> Optional[SourceRecord]:
+            return self._scrape_post(
+                url, content_selector, rate_limiter, priority_keywords, keywords_lower
+            )
+
         records = []
-        for url in post_urls:
-            record = self._scrape_post(url, content_selector, rate_limiter, priority_keywords)
+        for _, record in map_queue(deque(post_urls), scrape_post):
             if record:
                 records.append(record)
 
@@ -116,11 +123,15 @@ class BlogScraper:
 
         pages_checked = 0
 
-        while queue and pages_checked < max_pages * 2:
-            url = queue.popleft()
-            pages_checked += 1
+        def fetch(url: str):
+            return fetch_url(url, rate_limiter=rate_limiter)
 
-            response = fetch_url(url, rate_limiter=rate_limiter)
+        for url, response in map_queue(queue, fetch):
+            # Stop once enough candidate posts are known, not only when the
+            # page budget runs out
+            if pages_checked >= max_pages * 2 or len(post_urls) >= max_pages:
+                break
+            pages_checked += 1
             if not response:
                 continue
 
@@ -137,10 +148,13 @@ class BlogScraper:
                 # Heuristic: blog post URLs typically contain date patterns or /blog/post-slug
                 if self._looks_like_post_url(norm_link, base_url):
                     post_urls.append(norm_link)
+                    if len(post_urls) >= max_pages:
+                        break
                 elif self._looks_like_listing_page(norm_link, base_url):
                     queue.append(norm_link)
 
-        return list(dict.fromkeys(post_urls))  # Dedupe preserving order
+        # Already unique: each link is checked against visited before appending
+        return post_urls
 
     def _looks_like_post_url(self, url: str, base_url: str) -> bool:
         """Heuristic: does this URL look like a blog post?"""
@@ -178,18 +192,24 @@ class BlogScraper:
         content_selector: str,
         rate_limiter: RateLimiter,
         priority_keywords: list[str],
+        keywords_lower: list[str],
     ) -> Optional[SourceRecord]:
-        """Scrape a single blog post."""
+        """Scrape a single blog post.
+
+        keywords_lower holds priority_keywords already lowercased, in order.
+        """
         response = fetch_url(url, rate_limiter=rate_limiter)
         if not response:
             return None
 
         title, text = extract_content(response.text, content_selector, url)
-        if not text.strip() or count_words(text) < 50:
+        word_count = count_words(text)
+        if not text.strip() or word_count < 50:
             return None
 
-        # Score relevance
-        relevance_score = self._score_relevance(title + " " + text, priority_keywords)
+        relevance_score, matched = self._score_relevance(
+            (title + " " + text).lower(), priority_keywords, keywords_lower
+        )
 
         # Try to extract publication date
         content_date = extract_date_from_text(text)
@@ -204,23 +224,27 @@ class BlogScraper:
             scraped_date=date.today(),
             content_date=content_date,
             credibility=Credibility.OFFICIAL,
-            word_count=count_words(text),
+            word_count=word_count,
             metadata={
                 "relevance_score": relevance_score,
-                "priority_keywords_matched": [
-                    kw for kw in priority_keywords
-                    if kw.lower() in (title + " " + text).lower()
-                ],
+                "priority_keywords_matched": matched,
             },
         )
 
-    def _score_relevance(self, text: str, keywords: list[str]) -> float:
-        """Score text relevance based on keyword matches."""
+    def _score_relevance(
+        self, text_lower: str, keywords: list[str], keywords_lower: list[str]
+    ) -> tuple[float, list[str]]:
+        """Score already-lowered text by the share of keywords it contains.
+
+        Returns:
+            (score, matched keywords in their original casing and order).
+        """
         if not keywords:
-            return 0.0
-        text_lower = text.lower()
-        matches = sum(1 for kw in keywords if kw.lower() in text_lower)
-        return matches / len(keywords)
+            return 0.0, []
+        matched = [
+            kw for kw, kw_lower in zip(keywords, keywords_lower) if kw_lower in text_lower
+        ]
+        return len(matched) / len(keywords), matched
 
 
 def scrape_blog(competitor_config: dict, data_dir: str) -> list[SourceRecord]:
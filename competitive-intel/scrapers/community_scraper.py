@@ -4,13 +4,14 @@ Uses Reddit's public JSON API and Hacker News Algolia API to find
 discussions, complaints, comparisons, and real-world experience reports.
 """
 
+import html
 import logging
+import re
 import time
 from datetime import date, datetime
 from typing import Optional
 
 import requests
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 from schemas.source_record import (
     Credibility,
@@ -20,7 +21,7 @@ from schemas.source_record import (
     SourceRecord,
     SourceType,
 )
-from scrapers.utils import count_words, generate_record_id, save_records
+from scrapers.utils import count_words, generate_record_id, http_session, save_records
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +31,76 @@ REDDIT_HEADERS = {
 
 HN_ALGOLIA_BASE = "https://hn.algolia.com/api/v1"
 
+# HN comment markup: tags are dropped, entities decoded afterwards
+_HTML_TAG = re.compile(r"<[^>]+>")
+
+# Attempts per search request on connection errors and timeouts
+SEARCH_ATTEMPTS = 3
+
+# Reddit search returns at most this many results per request
+REDDIT_PAGE_LIMIT = 100
+# Reddit rejects search queries longer than this
+REDDIT_QUERY_MAX_CHARS = 512
+
+# Phrases counted (once each) by _estimate_sentiment
+NEGATIVE_SIGNALS = (
+    "problem", "issue", "bug", "broken", "crash", "slow",
+    "limitation", "missing", "doesn't support", "can't",
+    "disappointing", "frustrating", "worse", "awful",
+    "not production", "not ready", "unstable",
+)
+POSITIVE_SIGNALS = (
+    "fast", "great", "excellent", "love", "amazing",
+    "impressed", "recommend", "solid", "reliable",
+    "production ready", "best", "performant",
+)
+
+
+def _get_with_retry(url: str, **kwargs) -> requests.Response:
+    """GET with exponential backoff (2s, 4s, ...) on connection errors and timeouts.
+
+    The last failure is re-raised for the caller to handle.
+    """
+    for attempt in range(SEARCH_ATTEMPTS):
+        try:
+            return http_session().get(url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == SEARCH_ATTEMPTS - 1:
+                raise
+            delay = min(10, 2 * 2**attempt)
+            logger.warning("Request to %s failed (%s), retrying in %ds", url, e, delay)
+            time.sleep(delay)
+
+
+def _reddit_or_queries(terms: list[str], per_term: int) -> list[tuple[str, int]]:
+    """Group search terms into Reddit OR queries.
+
+    Each query ORs as many terms as fit in one result page at per_term
+    results apiece, so a search returns about as many results as the
+    separate per-term searches would have. Terms stay parenthesized, so
+    multi-word terms keep their all-words matching. Returns
+    (query, result limit) pairs; a lone term is sent unchanged.
+    """
+    batch_size = max(1, REDDIT_PAGE_LIMIT // max(1, per_term))
+    batches: list[list[str]] = []
+    for term in terms:
+        batch = batches[-1] if batches else None
+        if (
+            batch
+            and len(batch) < batch_size
+            and len(_or_query(batch + [term])) <= REDDIT_QUERY_MAX_CHARS
+        ):
+            batch.append(term)
+        else:
+            batches.append([term])
+    return [(_or_query(batch), per_term * len(batch)) for batch in batches]
+
+
+def _or_query(terms: list[str]) -> str:
+    if len(terms) == 1:
+        return terms[0]
+    return " OR ".join(f"({term})" for term in terms)
+
 
 class CommunityScraper:
     """Scrapes Reddit and Hacker News for community discussions."""
@@ -70,9 +141,9 @@ class CommunityScraper:
         seen_urls = set()
         records = []
 
-        # Search globally
-        for term in search_terms:
-            results = self._reddit_search(term, max_results=max_results)
+        # Search globally, several terms per request
+        for query, limit in _reddit_or_queries(search_terms, max_results):
+            results = self._reddit_search(query, max_results=limit)
             for post in results:
                 url = f"https://www.reddit.com{post.get('permalink', '')}"
                 if url in seen_urls:
@@ -86,10 +157,12 @@ class CommunityScraper:
             time.sleep(1.0)  # Rate limit between searches
 
         # Search in specific subreddits
+        # Limit per-subreddit terms; these usually fit in a single request
+        subreddit_queries = _reddit_or_queries(search_terms[:3], max_results // 2)
         for subreddit in subreddits:
-            for term in search_terms[:3]:  # Limit per-subreddit queries
+            for query, limit in subreddit_queries:
                 results = self._reddit_search(
-                    term, subreddit=subreddit, max_results=max_results // 2
+                    query, subreddit=subreddit, max_results=limit
                 )
                 for post in results:
                     url = f"https://www.reddit.com{post.get('permalink', '')}"
@@ -109,11 +182,6 @@ class CommunityScraper:
         logger.info("Scraped %d Reddit posts for %s", len(records), self.origin)
         return records
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((requests.ConnectionError, requests.Timeout)),
-    )
     def _reddit_search(
         self, query: str, subreddit: Optional[str] = None, max_results: int = 50
     ) -> list[dict]:
@@ -126,7 +194,7 @@ class CommunityScraper:
             params = {"q": query, "limit": min(max_results, 100), "sort": "relevance"}
 
         try:
-            resp = requests.get(url, headers=REDDIT_HEADERS, params=params, timeout=15)
+            resp = _get_with_retry(url, headers=REDDIT_HEADERS, params=params, timeout=15)
             if resp.status_code == 429:
                 logger.warning("Reddit rate limited, sleeping 60s")
                 time.sleep(60)
@@ -203,11 +271,6 @@ class CommunityScraper:
         logger.info("Scraped %d HN stories for %s", len(records), self.origin)
         return records
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((requests.ConnectionError, requests.Timeout)),
-    )
     def _hn_search(self, query: str, max_results: int = 50) -> list[dict]:
         """Search Hacker News via Algolia API."""
         url = f"{HN_ALGOLIA_BASE}/search"
@@ -217,7 +280,7 @@ class CommunityScraper:
             "tags": "story",
         }
         try:
-            resp = requests.get(url, params=params, timeout=15)
+            resp = _get_with_retry(url, params=params, timeout=15)
             resp.raise_for_status()
             return resp.json().get("hits", [])
         except (requests.RequestException, ValueError) as e:
@@ -275,16 +338,15 @@ class CommunityScraper:
         """Fetch top comments for an HN story."""
         url = f"{HN_ALGOLIA_BASE}/items/{story_id}"
         try:
-            resp = requests.get(url, timeout=15)
+            resp = http_session().get(url, timeout=15)
             resp.raise_for_status()
             data = resp.json()
             comments = []
             for child in data.get("children", [])[:max_comments]:
                 text = child.get("text", "")
                 if text:
-                    # Strip HTML tags from HN comments
-                    import re
-                    clean = re.sub(r"<[^>]+>", " ", text).strip()
+                    # Strip HTML tags and decode entities (&#x27;, &amp;, ...)
+                    clean = html.unescape(_HTML_TAG.sub(" ", text)).strip()
                     author = child.get("author", "anon")
                     comments.append(f"**{author}**: {clean}")
             return comments
@@ -294,21 +356,8 @@ class CommunityScraper:
     def _estimate_sentiment(self, text: str) -> Sentiment:
         """Basic keyword-based sentiment estimation."""
         text_lower = text.lower()
-
-        negative_signals = [
-            "problem", "issue", "bug", "broken", "crash", "slow",
-            "limitation", "missing", "doesn't support", "can't",
-            "disappointing", "frustrating", "worse", "awful",
-            "not production", "not ready", "unstable",
-        ]
-        positive_signals = [
-            "fast", "great", "excellent", "love", "amazing",
-            "impressed", "recommend", "solid", "reliable",
-            "production ready", "best", "performant",
-        ]
-
-        neg_count = sum(1 for s in negative_signals if s in text_lower)
-        pos_count = sum(1 for s in positive_signals if s in text_lower)
+        neg_count = sum(1 for s in NEGATIVE_SIGNALS if s in text_lower)
+        pos_count = sum(1 for s in POSITIVE_SIGNALS if s in text_lower)
 
         if neg_count > pos_count + 1:
             return Sentiment.NEGATIVE
@@ -19,7 +19,9 @@ from scrapers.utils import (
     fetch_url,
     generate_record_id,
     is_same_domain,
+    map_queue,
     normalize_url,
+    parse_html,
     save_records,
 )
 
@@ -120,20 +122,30 @@ class DocsScraper:
         # BFS queue: (url, depth)
         queue: deque[tuple[str, int]] = deque()
         start_url = normalize_url(base_url)
-        queue.append((start_url, 0))
         visited.add(start_url)
-
-        while queue and len(records) < max_pages:
-            url, depth = queue.popleft()
-
-            if self._should_exclude(url, exclude_patterns):
-                continue
-
-            response = fetch_url(url, rate_limiter=rate_limiter)
+        # Followed links are filtered before queueing, so only the start URL
+        # needs checking here
+        if not self._should_exclude(start_url, exclude_patterns):
+            queue.append((start_url, 0))
+
+        # Each batch of the queue is fetched concurrently; pages are still
+        # processed one at a time, in BFS order
+        def fetch(item: tuple[str, int]):
+            return fetch_url(item[0], rate_limiter=rate_limiter)
+
+        for (url, depth), response in map_queue(queue, fetch):
+            if len(records) >= max_pages:
+                break
             if not response:
                 continue
 
-            title, text = extract_content(response.text, content_selector, url)
+            # One parse for links and content; links are taken first, since
+            # extract_content strips navigation from the soup
+            soup = parse_html(response.text)
+            links = []
+            if depth < max_depth:
+                links = extract_links(soup, url, content_selector)
+            title, text = extract_content(soup, content_selector, url)
             if not text.strip():
                 continue
 
@@ -151,17 +163,15 @@ class DocsScraper:
             records.append(record)
 
             # Follow links if within depth limit
-            if depth < max_depth:
-                links = extract_links(response.text, url, content_selector)
-                for link in links:
-                    norm_link = normalize_url(link)
-                    if (
-                        norm_link not in visited
-                        and is_same_domain(norm_link, base_url)
-                        and not self._should_exclude(norm_link, exclude_patterns)
-                    ):
-                        visited.add(norm_link)
-                        queue.append((norm_link, depth + 1))
+            for link in links:
+                norm_link = normalize_url(link)
+                if (
+                    norm_link not in visited
+                    and is_same_domain(norm_link, base_url)
+                    and not self._should_exclude(norm_link, exclude_patterns)
+                ):
+                    visited.add(norm_link)
+                    queue.append((norm_link, depth + 1))
 
             if len(records) % 50 == 0:
                 logger.info("Crawled %d pages so far...", len(records))
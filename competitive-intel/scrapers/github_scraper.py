@@ -21,7 +21,7 @@ from schemas.source_record import (
     SourceRecord,
     SourceType,
 )
-from scrapers.utils import count_words, generate_record_id, save_records
+from scrapers.utils import count_words, generate_record_id, http_session, save_records
 
 logger = logging.getLogger(__name__)
 
@@ -49,7 +49,7 @@ def _get_github_headers() -> dict:
 )
 def _github_get(url: str, params: Optional[dict] = None) -> Optional[requests.Response]:
     headers = _get_github_headers()
-    resp = requests.get(url, headers=headers, params=params, timeout=30)
+    resp = http_session().get(url, headers=headers, params=params, timeout=30)
     if resp.status_code == 403:
         logger.error("GitHub rate limit hit. Remaining: %s", resp.headers.get("X-RateLimit-Remaining"))
         return None
@@ -65,7 +65,7 @@ def _github_get(url: str, params: Optional[dict] = None) -> Optional[requests.Re
 def _github_graphql(query: str, variables: Optional[dict] = None) -> Optional[dict]:
     headers = _get_github_headers()
     headers["Content-Type"] = "application/json"
-    resp = requests.post(
+    resp = http_session().post(
         GITHUB_GRAPHQL,
         json={"query": query, "variables": variables or {}},
         headers=headers,
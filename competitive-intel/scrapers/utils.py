@@ -3,13 +3,18 @@
 import hashlib
 import logging
 import re
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Callable, Iterator, Optional, Union
 from urllib.parse import urljoin, urlparse, urlunparse
 
 import requests
 from bs4 import BeautifulSoup, Tag
+from requests.adapters import HTTPAdapter
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -25,19 +30,59 @@ DEFAULT_HEADERS = {
     "Accept-Language": "en-US,en;q=0.5",
 }
 
+# Concurrent fetches per crawl; RateLimiter still spaces the request starts
+FETCH_WORKERS = 8
+
+# Keep-alive connections kept per host by the shared session
+HTTP_POOL_SIZE = 20
+
+# Distinct (url, base_url) pairs remembered by normalize_url
+NORMALIZE_CACHE_SIZE = 100_000
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
 
 class RateLimiter:
-    """Simple rate limiter that enforces minimum delay between requests."""
+    """Enforces a minimum delay between request starts, across threads.
+
+    Each caller reserves the next free slot under a lock and sleeps outside
+    it, so concurrent fetchers are spaced min_delay apart without blocking
+    each other for the length of a request.
+    """
 
     def __init__(self, min_delay: float = 0.5):
         self.min_delay = min_delay
-        self._last_request_time = 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
 
     def wait(self):
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self.min_delay:
-            time.sleep(self.min_delay - elapsed)
-        self._last_request_time = time.time()
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_delay
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def http_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use.
+
+    Reusing one session keeps connections alive between requests to the
+    same host, so crawls and API searches skip a TCP+TLS handshake per
+    call. Retries are left to the callers.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=0
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSION = session
+        return _SESSION
 
 
 def fetch_url(
@@ -57,6 +102,24 @@ def fetch_url(
         return None
 
 
+def map_queue(
+    queue: deque,
+    func: Callable[[Any], Any],
+    workers: int = FETCH_WORKERS,
+) -> Iterator[tuple[Any, Any]]:
+    """Pop queue in batches, running func on each batch concurrently.
+
+    Yields (item, func(item)) in queue order. Items the caller appends
+    while handling a batch are picked up by later batches, so a BFS driven
+    by this visits pages in the same order as a serial popleft loop; at
+    most workers - 1 results are wasted if the caller stops early.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while queue:
+            batch = [queue.popleft() for _ in range(min(workers, len(queue)))]
+            yield from zip(batch, executor.map(func, batch))
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=2, max=10),
@@ -74,7 +137,7 @@ def _fetch_url_with_retry(
 
     merged_headers = {**DEFAULT_HEADERS, **(headers or {})}
     try:
-        response = requests.get(url, headers=merged_headers, timeout=timeout)
+        response = http_session().get(url, headers=merged_headers, timeout=timeout)
         if response.status_code == 404:
             logger.warning("404 Not Found: %s", url)
             return None
@@ -85,8 +148,13 @@ def _fetch_url_with_retry(
         return None
 
 
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def normalize_url(url: str, base_url: Optional[str] = None) -> str:
-    """Normalize a URL: resolve relative, remove fragments and trailing slashes."""
+    """Normalize a URL: resolve relative, remove fragments and trailing slashes.
+
+    Memoized, since crawls see the same links on many pages and normalize
+    each one again before the visited check.
+    """
     if base_url:
         url = urljoin(base_url, url)
     parsed = urlparse(url)
@@ -117,16 +185,24 @@ def is_html_url(url: str) -> bool:
     return True
 
 
+def parse_html(html: str) -> BeautifulSoup:
+    """Parse a page once, to pass to both extract_links and extract_content."""
+    return BeautifulSoup(html, "lxml")
+
+
 def extract_content(
-    html: str,
+    html: Union[str, BeautifulSoup],
     content_selector: str = "article",
     url: str = "",
 ) -> tuple[str, str]:
     """Extract main content text and title from HTML.
 
+    html may be a soup from parse_html. Boilerplate elements are removed
+    from it in place, so extract links from a shared soup first.
+
     Returns (title, text) tuple.
     """
-    soup = BeautifulSoup(html, "lxml")
+    soup = html if isinstance(html, BeautifulSoup) else parse_html(html)
 
     # Extract title
     title = ""
@@ -276,9 +352,14 @@ def extract_date_from_text(text: str) -> Optional[date]:
     return None
 
 
-def extract_links(html: str, base_url: str, content_selector: str = "body") -> list[str]:
-    """Extract all internal links from a page within the content area."""
-    soup = BeautifulSoup(html, "lxml")
+def extract_links(
+    html: Union[str, BeautifulSoup], base_url: str, content_selector: str = "body"
+) -> list[str]:
+    """Extract all internal links from a page within the content area.
+
+    html may be a soup from parse_html; it is not modified.
+    """
+    soup = html if isinstance(html, BeautifulSoup) else parse_html(html)
     content = soup.select_one(content_selector) or soup.find("body")
     if not content:
         return []
@@ -293,27 +374,156 @@ def extract_links(html: str, base_url: str, content_selector: str = "body") -> l
     return list(set(links))
 
 
+# TypeAdapter(list[Model]) per model class saved through save_records
+_LIST_ADAPTERS: dict = {}
+
+
+def _dump_models(records: list) -> list:
+    """JSON-mode dump of a list of models in a single pydantic-core call.
+
+    Falls back to per-record model_dump when the list mixes model classes.
+    """
+    if not records:
+        return []
+    model = type(records[0])
+    if any(type(r) is not model for r in records):
+        return [r.model_dump(mode="json") for r in records]
+    adapter = _LIST_ADAPTERS.get(model)
+    if adapter is None:
+        from pydantic import TypeAdapter
+
+        adapter = _LIST_ADAPTERS[model] = TypeAdapter(list[model])
+    return adapter.dump_python(records, mode="json")
+
+
+# Directories ensure_dir has already created in this process
+_created_dirs: set = set()
+
+
+def ensure_dir(path) -> None:
+    """mkdir -p, skipped for directories already ensured in this process."""
+    from pathlib import Path
+
+    path = Path(path)
+    if path in _created_dirs:
+        return
+    path.mkdir(parents=True, exist_ok=True)
+    _created_dirs.add(path)
+
+
 def save_records(records: list, output_dir: str, filename: str):
     """Save a list of Pydantic model instances to a JSON file."""
     import orjson
     from pathlib import Path
 
     output_path = Path(output_dir)
-    output_path.mkdir(parents=True, exist_ok=True)
+    ensure_dir(output_path)
 
     filepath = output_path / filename
-    data = [r.model_dump(mode="json") for r in records]
-    filepath.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    filepath.write_bytes(orjson.dumps(_dump_models(records), option=orjson.OPT_INDENT_2))
     logger.info("Saved %d records to %s", len(records), filepath)
     return filepath
 
 
+def load_json(filepath):
+    """Parse a JSON file straight from a read-only memory map.
+
+    orjson reads the mapped pages directly, so the file contents are never
+    copied into an intermediate bytes object.
+    """
+    import mmap
+    import os
+    import orjson
+
+    with open(filepath, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return orjson.loads(b"")  # mmap can't map an empty file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+
 def load_records(filepath: str) -> list[dict]:
     """Load records from a JSON file."""
-    import orjson
     from pathlib import Path
 
     path = Path(filepath)
     if not path.exists():
         return []
-    return orjson.loads(path.read_bytes())
+    return load_json(path)
+
+
+# Record files at least this large are streamed instead of loaded whole
+STREAM_MIN_BYTES = 10 * 1024 * 1024
+
+
+def _ijson_if_large(path):
+    """Return the ijson module if path should be streamed, else None."""
+    if path.stat().st_size < STREAM_MIN_BYTES:
+        return None
+    try:
+        import ijson
+    except ImportError:
+        return None
+    return ijson
+
+
+def iter_records(filepath: str):
+    """Yield records from a JSON array file one at a time.
+
+    Large files are parsed incrementally with ijson when it is installed, so
+    the whole array is never held in memory; small files use orjson.
+    """
+    from pathlib import Path
+
+    path = Path(filepath)
+    if not path.exists():
+        return
+    ijson = _ijson_if_large(path)
+    if ijson is None:
+        yield from load_records(filepath)
+        return
+    with open(path, "rb") as f:
+        yield from ijson.items(f, "item", use_float=True)
+
+
+def count_records(filepath: str) -> int:
+    """Count the records in a JSON array file without keeping them."""
+    from pathlib import Path
+
+    path = Path(filepath)
+    if not path.exists():
+        return 0
+    ijson = _ijson_if_large(path)
+    if ijson is None:
+        return len(load_records(filepath))
+    with open(path, "rb") as f:
+        return sum(1 for _ in ijson.items(f, "item", use_float=True))
+
+
+_SOURCE_RECORDS_ADAPTER = None
+
+
+def parse_source_records(raw: bytes) -> list:
+    """Parse and validate a JSON array of records into SourceRecord models.
+
+    Validation runs over the whole document in one pydantic-core pass rather
+    than building each SourceRecord from an intermediate dict.
+    """
+    global _SOURCE_RECORDS_ADAPTER
+    if _SOURCE_RECORDS_ADAPTER is None:
+        from pydantic import TypeAdapter
+        from schemas.source_record import SourceRecord
+
+        _SOURCE_RECORDS_ADAPTER = TypeAdapter(list[SourceRecord])
+    return _SOURCE_RECORDS_ADAPTER.validate_json(raw)
+
+
+def load_source_records(filepath: str) -> list:
+    """Load and validate SourceRecords from a JSON file."""
+    from pathlib import Path
+
+    path = Path(filepath)
+    if not path.exists():
+        return []
+    return parse_source_records(path.read_bytes())
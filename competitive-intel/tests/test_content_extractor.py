@@ -0,0 +1,100 @@
+"""ContentExtractor.clean_text must match the original sequential cleaner."""
+
+import random
+import re
+import unittest
+
+from processors.content_extractor import ContentExtractor
+
+# The cleaner as originally written: four strip passes in order, then
+# whitespace normalization. Kept verbatim as the reference.
+_REFERENCE_STRIP = [
+    re.compile(
+        r"(we use cookies|cookie policy|accept all cookies|manage preferences).*?\.",
+        re.IGNORECASE | re.DOTALL,
+    ),
+    re.compile(
+        r"(subscribe to|sign up for|join our|get the latest).*?(newsletter|updates|news).*?\.",
+        re.IGNORECASE | re.DOTALL,
+    ),
+    re.compile(
+        r"(share on|follow us on|tweet this|share this).*?(twitter|linkedin|facebook|x\.com).*?\n",
+        re.IGNORECASE,
+    ),
+    re.compile(
+        r"©\s*\d{4}.*?(all rights reserved|inc\.|ltd\.|corp\.).*?\n",
+        re.IGNORECASE,
+    ),
+]
+
+
+def _reference_clean(text: str) -> str:
+    for pattern in _REFERENCE_STRIP:
+        text = pattern.sub("", text)
+    normalized = []
+    for part in re.split(r"(```[\s\S]*?```)", text):
+        if part.startswith("```"):
+            normalized.append(part)
+            continue
+        lines = []
+        for line in part.split("\n"):
+            if line.strip().startswith(("#", "|", "-", "*", "1.", "2.", "3.")):
+                lines.append(line)
+            else:
+                lines.append(re.sub(r"  +", " ", line))
+        normalized.append("\n".join(lines))
+    text = re.sub(r"\n{3,}", "\n\n", "".join(normalized))
+    return text.strip()
+
+
+# Boilerplate triggers and terminators, plus characters where Unicode and
+# ASCII matching differ (Kelvin sign, long s, NNBSP, \x1c, Arabic digits)
+_PIECES = [
+    "We use cookies", "cookie policy", "Accept all cookies", "manage preferences",
+    "Subscribe to", "sign up for", "Join our", "get the latest",
+    "newsletter", "updates", "news", "share on", "Follow us on", "tweet this",
+    "Twitter", "LinkedIn", "x.com", "©", "© 2024", "©\u202f2024",
+    "©\xa0\u0662\u0660\u0662\u0664",
+    "\x1c2023", "All rights reserved", "Inc.", "Ltd.", "corp.", "2024",
+    "\u212a", "\u017fubscribe to", "\u017fign up for", ".", ". ", "\n", "\n\n\n",
+    "  ", "   ", "- item", "# Heading  x", "| a  | b |", "```code  x```",
+    "real content", "the product", "data", "KDB+", " ",
+]
+
+
+class CleanTextEquivalenceTest(unittest.TestCase):
+    def test_matches_reference_on_fuzzed_boilerplate(self):
+        extractor = ContentExtractor()
+        rng = random.Random(0)
+        for _ in range(20_000):
+            text = "".join(rng.choice(_PIECES) for _ in range(rng.randint(0, 30)))
+            self.assertEqual(extractor.clean_text(text), _reference_clean(text), repr(text))
+
+    def test_earlier_pattern_wins_over_later_one(self):
+        extractor = ContentExtractor()
+        self.assertEqual(
+            extractor.clean_text(
+                "Join our Slack community. We use cookies to improve news delivery."
+            ),
+            "Join our Slack community.",
+        )
+        self.assertEqual(
+            extractor.clean_text(
+                "Sign up for the beta today. "
+                "Accept all cookies to receive product updates."
+            ),
+            "Sign up for the beta today.",
+        )
+
+    def test_copyright_after_unicode_space_is_stripped(self):
+        extractor = ContentExtractor()
+        self.assertEqual(
+            extractor.clean_text(
+                "Body\nCopyright ©\u202f2024 Acme Inc. All rights reserved\n"
+            ),
+            "Body\nCopyright",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -16,7 +16,7 @@ import hashlib
 import logging
 import re
 from datetime import date
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 import tiktoken
 
@@ -119,11 +119,11 @@ def _load_topic_names() -> dict[str, str]:
     global _TOPIC_NAMES
     if _TOPIC_NAMES:
         return _TOPIC_NAMES
-    import json
+    import orjson
     from pathlib import Path
     taxonomy_path = Path(__file__).parent.parent / "config" / "taxonomy.json"
     if taxonomy_path.exists():
-        data = json.load(open(taxonomy_path))
+        data = orjson.loads(taxonomy_path.read_bytes())
         for tier in data.get("tiers", {}).values():
             for tid, info in tier.get("topics", {}).items():
                 _TOPIC_NAMES[tid] = info.get("name", tid)
@@ -203,7 +203,7 @@ class Chunker:
                 source_type=record.source_type.value,
                 source_url=record.url,
                 source_title=record.title,
-                topic_ids=record.topics if record.topics else ["unclassified"],
+                topic_ids=list(record.topics) if record.topics else ["unclassified"],
                 credibility=record.credibility.value if hasattr(record.credibility, 'value') else str(record.credibility),
                 content_date=record.content_date,
                 scraped_date=record.scraped_date,
@@ -215,6 +215,47 @@ class Chunker:
 
         return raw_chunks
 
+    def iter_chunks(
+        self,
+        records: Iterable[SourceRecord],
+        max_workers: int = 1,
+        chunksize: int = 32,
+    ) -> Iterator[RawChunk]:
+        """Lazily chunk records, yielding chunks one record at a time.
+
+        With max_workers > 1, records are chunked in a process pool
+        (tokenization is CPU-bound and holds the GIL), chunksize records
+        per task. At most two tasks per worker are in flight, so records
+        are pulled from the input only as output is consumed. Output order
+        is the same as the sequential path.
+        """
+        if max_workers <= 1:
+            for record in records:
+                yield from self.chunk_record(record)
+            return
+
+        from collections import deque
+        from concurrent.futures import ProcessPoolExecutor
+        from itertools import islice
+
+        records = iter(records)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            while True:
+                while len(pending) < 2 * max_workers:
+                    batch = list(islice(records, chunksize))
+                    if not batch:
+                        break
+                    pending.append(executor.submit(self._chunk_batch, batch))
+                if not pending:
+                    return
+                for chunks in pending.popleft().result():
+                    yield from chunks
+
+    def _chunk_batch(self, records: list[SourceRecord]) -> list[list[RawChunk]]:
+        """Chunk each record of a batch; one process pool task."""
+        return [self.chunk_record(record) for record in records]
+
     def chunk_records(self, records: list[SourceRecord]) -> list[RawChunk]:
         """Chunk a batch of SourceRecords."""
         import time as _time
@@ -10,7 +10,7 @@ backoff retry for rate limit handling.
 import logging
 import os
 import time
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 import tiktoken
 from openai import BadRequestError, OpenAI
@@ -70,12 +70,21 @@ class Embedder:
         sorted_data = sorted(response.data, key=lambda x: x.index)
         return [item.embedding for item in sorted_data]
 
-    def embed(self, texts: list[str], show_progress: bool = True) -> list[list[float]]:
+    def embed(
+        self,
+        texts: list[str],
+        show_progress: bool = True,
+        batch_size: int = MAX_BATCH_SIZE,
+        token_counts: Optional[list[int]] = None,
+    ) -> list[list[float]]:
         """Embed a list of texts, handling batching automatically.
 
         Args:
             texts: List of text strings to embed.
             show_progress: Whether to log progress.
+            batch_size: Texts per API call (capped at MAX_BATCH_SIZE).
+            token_counts: Known token count per text (e.g. RawChunk.token_count).
+                When given, only texts over the limit are re-tokenized.
 
         Returns:
             List of embedding vectors (same order as input texts).
@@ -84,15 +93,22 @@ class Embedder:
             return []
 
         # Truncate any oversized texts to fit the model's token limit
-        texts = [self._truncate_text(t) for t in texts]
-
+        if token_counts is None:
+            texts = [self._truncate_text(t) for t in texts]
+        else:
+            texts = [
+                self._truncate_text(t) if n > MAX_TOKENS_PER_TEXT else t
+                for t, n in zip(texts, token_counts)
+            ]
+
+        batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
         all_embeddings: list[list[float]] = []
-        total_batches = (len(texts) + MAX_BATCH_SIZE - 1) // MAX_BATCH_SIZE
+        total_batches = (len(texts) + batch_size - 1) // batch_size
         overall_start = time.time()
 
         for batch_idx in range(total_batches):
-            start = batch_idx * MAX_BATCH_SIZE
-            end = min(start + MAX_BATCH_SIZE, len(texts))
+            start = batch_idx * batch_size
+            end = min(start + batch_size, len(texts))
             batch = texts[start:end]
 
             batch_start = time.time()
@@ -122,6 +138,41 @@ class Embedder:
         )
         return all_embeddings
 
+    def embed_iter(
+        self,
+        chunks: Iterable,
+        batch_size: int = MAX_BATCH_SIZE,
+    ) -> Iterator[tuple]:
+        """Embed a stream of chunks, yielding (chunk, embedding) pairs.
+
+        Accumulates up to batch_size chunks (anything with ``.text`` and
+        ``.token_count`` attributes), embeds them in one call, and yields the results before
+        pulling more input, so memory stays bounded by one batch.
+        """
+        batch: list = []
+        batches_done = 0
+        for chunk in chunks:
+            batch.append(chunk)
+            if len(batch) >= batch_size:
+                if batches_done:
+                    time.sleep(0.5)  # Same inter-batch pause as embed()
+                yield from zip(batch, self._embed_chunks(batch))
+                batches_done += 1
+                batch = []
+
+        if batch:
+            if batches_done:
+                time.sleep(0.5)
+            yield from zip(batch, self._embed_chunks(batch))
+
+    def _embed_chunks(self, chunks: list) -> list[list[float]]:
+        """Embed chunk texts, reusing their precomputed token counts."""
+        return self.embed(
+            [c.text for c in chunks],
+            show_progress=False,
+            token_counts=[c.token_count for c in chunks],
+        )
+
     def embed_single(self, text: str) -> list[float]:
         """Embed a single text string (convenience method for queries)."""
         result = self.embed([text], show_progress=False)
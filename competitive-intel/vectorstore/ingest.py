@@ -11,7 +11,6 @@ Or via the main pipeline:
 """
 
 import argparse
-import json
 import logging
 import sys
 import time
@@ -36,7 +35,8 @@ RAW_DIR = PROJECT_ROOT / "data" / "raw"
 
 def load_all_records(target: str) -> list[SourceRecord]:
     """Load all raw JSON records for a given target (competitor short name)."""
-    import orjson
+    from pydantic import ValidationError
+    from scrapers.utils import load_json, parse_source_records
 
     t0 = time.perf_counter()
     target_dir = RAW_DIR / target
@@ -51,15 +51,20 @@ def load_all_records(target: str) -> list[SourceRecord]:
     for jf in json_files:
         file_count_before = len(records)
         try:
-            data = orjson.loads(jf.read_bytes())
-            items = data if isinstance(data, list) else [data]
-            for item in items:
-                try:
-                    record = SourceRecord(**item)
-                    records.append(record)
-                except Exception as e:
-                    skipped += 1
-                    logger.debug("Skipping invalid record in %s: %s", jf.name, e)
+            # Validate the whole file in one pydantic-core pass; only a file
+            # holding an invalid record (or a single object) goes item by item
+            try:
+                records.extend(parse_source_records(jf.read_bytes()))
+            except ValidationError:
+                data = load_json(jf)
+                items = data if isinstance(data, list) else [data]
+                for item in items:
+                    try:
+                        record = SourceRecord(**item)
+                        records.append(record)
+                    except Exception as e:
+                        skipped += 1
+                        logger.debug("Skipping invalid record in %s: %s", jf.name, e)
         except Exception as e:
             logger.error("Failed to load %s: %s", jf, e)
         file_count = len(records) - file_count_before
@@ -120,7 +125,7 @@ def ingest_target(
     logger.info("[%s] STEP 3/4: Generating embeddings for %d chunks...", target, len(chunks))
     t0 = time.perf_counter()
     texts = [chunk.text for chunk in chunks]
-    embeddings = embedder.embed(texts)
+    embeddings = embedder.embed(texts, token_counts=[chunk.token_count for chunk in chunks])
     embed_elapsed = time.perf_counter() - t0
     logger.info("[%s] STEP 3/4 done: %d embeddings in %.1fs (%.1f chunks/sec)", target, len(embeddings), embed_elapsed, len(embeddings) / max(embed_elapsed, 0.001))
 
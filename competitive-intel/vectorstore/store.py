@@ -12,7 +12,7 @@ ChromaDB runs embedded (no server process) with persistent storage to disk.
 import logging
 from datetime import date
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 import chromadb
 
@@ -24,6 +24,10 @@ DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "vectordb"
 COLLECTION_SOURCE = "competitive_intel"
 COLLECTION_COMPARISONS = "competitive_comparisons"
 
+# ChromaDB accepts batches of up to 5461 items, but 100-250 per call keeps
+# each SQLite transaction and HNSW insert small enough to stay fast.
+UPSERT_BATCH_SIZE = 250
+
 # ChromaDB metadata supports: str, int, float, bool — not lists.
 # We serialize list fields (topic_ids) as comma-separated strings.
 
@@ -70,12 +74,14 @@ class VectorStore:
         self,
         chunks: list[RawChunk],
         embeddings: list[list[float]],
+        batch_size: int = UPSERT_BATCH_SIZE,
     ) -> int:
         """Upsert chunked source data into the competitive_intel collection.
 
         Args:
             chunks: List of RawChunk objects from the chunker.
             embeddings: Corresponding embedding vectors.
+            batch_size: Chunks per upsert call.
 
         Returns:
             Number of chunks upserted.
@@ -87,36 +93,55 @@ class VectorStore:
 
         collection = self.get_source_collection()
 
-        # ChromaDB accepts batches of up to 5461 items; we use 500 for safety
-        batch_size = 500
         total_upserted = 0
 
         for start in range(0, len(chunks), batch_size):
             end = min(start + batch_size, len(chunks))
-            batch_chunks = chunks[start:end]
-            batch_embeddings = embeddings[start:end]
+            self._upsert_source_batch(
+                collection, chunks[start:end], embeddings[start:end]
+            )
+            total_upserted += end - start
+            logger.info(
+                "Upserted batch %d-%d (%d chunks)",
+                start, end, end - start,
+            )
 
-            ids = []
-            documents = []
-            metadatas = []
+        logger.info(
+            "Total upserted to '%s': %d chunks",
+            COLLECTION_SOURCE, total_upserted,
+        )
+        return total_upserted
 
-            for chunk in batch_chunks:
-                ids.append(chunk.id)
-                documents.append(chunk.text)
-                metadatas.append(self._chunk_to_metadata(chunk))
+    def upsert_iter(
+        self,
+        pairs: Iterable[tuple[RawChunk, list[float]]],
+        batch_size: int = UPSERT_BATCH_SIZE,
+    ) -> int:
+        """Upsert a stream of (chunk, embedding) pairs in fixed-size batches.
 
-            collection.upsert(
-                ids=ids,
-                documents=documents,
-                embeddings=batch_embeddings,
-                metadatas=metadatas,
-            )
+        Only one batch is held in memory at a time, so this pairs with
+        Chunker.iter_chunks and Embedder.embed_iter for bounded-memory ingest.
 
+        Returns:
+            Number of chunks upserted.
+        """
+        collection = self.get_source_collection()
+        batch_chunks: list[RawChunk] = []
+        batch_embeddings: list[list[float]] = []
+        total_upserted = 0
+
+        for chunk, embedding in pairs:
+            batch_chunks.append(chunk)
+            batch_embeddings.append(embedding)
+            if len(batch_chunks) >= batch_size:
+                self._upsert_source_batch(collection, batch_chunks, batch_embeddings)
+                total_upserted += len(batch_chunks)
+                logger.info("Upserted %d chunks so far", total_upserted)
+                batch_chunks, batch_embeddings = [], []
+
+        if batch_chunks:
+            self._upsert_source_batch(collection, batch_chunks, batch_embeddings)
             total_upserted += len(batch_chunks)
-            logger.info(
-                "Upserted batch %d-%d (%d chunks)",
-                start, end, len(batch_chunks),
-            )
 
         logger.info(
             "Total upserted to '%s': %d chunks",
@@ -124,6 +149,20 @@ class VectorStore:
         )
         return total_upserted
 
+    def _upsert_source_batch(
+        self,
+        collection: chromadb.Collection,
+        chunks: list[RawChunk],
+        embeddings: list[list[float]],
+    ):
+        """Upsert one batch of source chunks into the given collection."""
+        collection.upsert(
+            ids=[chunk.id for chunk in chunks],
+            documents=[chunk.text for chunk in chunks],
+            embeddings=embeddings,
+            metadatas=[self._chunk_to_metadata(chunk) for chunk in chunks],
+        )
+
     # -------------------------------------------------------------------
     # Upsert comparison/generated chunks
     # -------------------------------------------------------------------
@@ -148,10 +187,9 @@ class VectorStore:
         """
         collection = self.get_comparison_collection()
 
-        batch_size = 500
         total = 0
-        for start in range(0, len(ids), batch_size):
-            end = min(start + batch_size, len(ids))
+        for start in range(0, len(ids), UPSERT_BATCH_SIZE):
+            end = min(start + UPSERT_BATCH_SIZE, len(ids))
             # Sanitize metadata values for ChromaDB
             sanitized_metas = [self._sanitize_metadata(m) for m in metadatas[start:end]]
             collection.upsert(